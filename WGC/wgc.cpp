@@ -5,13 +5,16 @@
 #include <d3d11.h>
 #include <dxgi1_2.h>
 #include <inspectable.h> 
+#include <algorithm>
 #include <atomic>
 #include <mutex>
-#include <memory> // for std::unique_ptr
+#include <memory> // for std::shared_ptr / std::weak_ptr
+#include <unordered_map>
 
 // C++/WinRT Headers
 #include <winrt/Windows.Foundation.h>
 #include <winrt/Windows.System.h>
+#include <winrt/Windows.Graphics.h>
 #include <winrt/Windows.Graphics.Capture.h>
 #include <winrt/Windows.Graphics.DirectX.Direct3D11.h>
 
@@ -35,15 +38,60 @@ struct __declspec(uuid("A9B3D012-3DF2-4EE3-B8D1-8695F457D3C1")) IDirect3DDxgiInt
     virtual HRESULT STDMETHODCALLTYPE GetInterface(REFIID iid, void** p) = 0;
 };
 
-// Global Manager Class
-class CaptureManager {
+// InitCaptureEx flags
+#define CAPTURE_FLAG_CENTER_ROI 0x1
+
+// Mirrors CaptureInfo in wgc_driver.py
+struct CaptureInfo {
+    int contentW;
+    int contentH;
+    int roiX;
+    int roiY;
+    int roiW;
+    int roiH;
+    unsigned int resizeCount;
+    unsigned int restartCount;
+    unsigned long long frameCount;
+};
+
+static const WGD::DirectXPixelFormat kPixelFormat = WGD::DirectXPixelFormat::B8G8R8A8UIntNormalized;
+
+// Helper: Create WinRT D3D Device from DXGI Device
+WGD3D::IDirect3DDevice CreateWinRTDevice(IDXGIDevice* dxgi_device) {
+    using PFN_CreateDirect3D11DeviceFromDXGIDevice = HRESULT(WINAPI*)(IDXGIDevice*, IInspectable**);
+    static PFN_CreateDirect3D11DeviceFromDXGIDevice pFunc = nullptr;
+
+    if (!pFunc) {
+        HMODULE hMod = LoadLibraryW(L"d3d11.dll");
+        if (hMod) pFunc = (PFN_CreateDirect3D11DeviceFromDXGIDevice)GetProcAddress(hMod, "CreateDirect3D11DeviceFromDXGIDevice");
+    }
+
+    if (pFunc) {
+        IInspectable* pInspectable = nullptr;
+        if (SUCCEEDED(pFunc(dxgi_device, &pInspectable))) {
+            WGD3D::IDirect3DDevice device = { nullptr };
+            winrt::attach_abi(device, pInspectable);
+            return device;
+        }
+    }
+    return nullptr;
+}
+
+// One capture session (one window). The legacy exports drive a single global instance;
+// the *For exports drive any number of independent instances identified by a handle.
+// Always owned by a shared_ptr: the FrameArrived handler only holds a weak_ptr, so a
+// callback that races with CloseCapture never touches a destroyed manager.
+class CaptureManager : public std::enable_shared_from_this<CaptureManager> {
 public:
     ID3D11Device* d3d11Device = nullptr;
     ID3D11DeviceContext* d3d11Context = nullptr;
+    WGD3D::IDirect3DDevice device = { nullptr };
 
+    HWND hwnd = nullptr;
     WGC::GraphicsCaptureItem item = { nullptr };
     WGC::Direct3D11CaptureFramePool framePool = { nullptr };
     WGC::GraphicsCaptureSession session = { nullptr };
+    winrt::event_token frameArrivedToken = {};
 
     ID3D11Texture2D* stagingTexture = nullptr;
 
@@ -53,93 +101,196 @@ public:
     int roi_x = 0, roi_y = 0, roi_w = 0, roi_h = 0;
     bool use_roi = false;
 
+    // Requested crop (as passed to InitCapture), re-applied whenever the content size changes
+    int req_x = 0, req_y = 0, req_w = 0, req_h = 0;
+    bool center_roi = false;
+
+    winrt::Windows::Graphics::SizeInt32 lastSize = { 0, 0 };
+    std::atomic<unsigned int> resizeCount = 0;
+    std::atomic<unsigned int> restartCount = 0;
+    std::atomic<unsigned long long> frameCount = 0;
+
     ~CaptureManager() {
         Cleanup();
     }
 
     void Cleanup() {
         try {
-            if (session) { session.Close(); session = nullptr; }
-            if (framePool) { framePool.Close(); framePool = nullptr; }
-            item = nullptr;
+            CloseSession();
 
+            // A callback that was already running when the handler was revoked may still be
+            // inside OnFrameArrived; it checks these under mtx before using them.
+            std::lock_guard<std::mutex> lock(mtx);
+            hasNewFrame = false;
             if (stagingTexture) { stagingTexture->Release(); stagingTexture = nullptr; }
+            device = nullptr;
             if (d3d11Context) { d3d11Context->Release(); d3d11Context = nullptr; }
             if (d3d11Device) { d3d11Device->Release(); d3d11Device = nullptr; }
         }
         catch (...) {}
     }
-};
 
-static std::unique_ptr<CaptureManager> g_Manager;
+    // Close the capture session / frame pool / item but keep the D3D device and staging texture
+    void CloseSession() {
+        if (framePool) {
+            // Revoke first so no new callbacks are dispatched once the pool is closed
+            framePool.FrameArrived(frameArrivedToken);
+            frameArrivedToken = {};
+        }
+        if (session) { session.Close(); session = nullptr; }
+        if (framePool) { framePool.Close(); framePool = nullptr; }
+        item = nullptr;
+    }
 
-// Helper: Create WinRT D3D Device from DXGI Device
-WGD3D::IDirect3DDevice CreateWinRTDevice(IDXGIDevice* dxgi_device) {
-    using PFN_CreateDirect3D11DeviceFromDXGIDevice = HRESULT(WINAPI*)(IDXGIDevice*, IInspectable**);
-    static PFN_CreateDirect3D11DeviceFromDXGIDevice pFunc = nullptr;
+    bool Init(HWND targetHwnd, int cropX, int cropY, int cropW, int cropH, int flags) {
+        try {
+            // 1. Initialize D3D11
+            HRESULT hr = D3D11CreateDevice(nullptr, D3D_DRIVER_TYPE_HARDWARE, nullptr, D3D11_CREATE_DEVICE_BGRA_SUPPORT, nullptr, 0, D3D11_SDK_VERSION, &d3d11Device, nullptr, &d3d11Context);
+            if (FAILED(hr)) return false;
 
-    if (!pFunc) {
-        HMODULE hMod = LoadLibraryW(L"d3d11.dll");
-        if (hMod) pFunc = (PFN_CreateDirect3D11DeviceFromDXGIDevice)GetProcAddress(hMod, "CreateDirect3D11DeviceFromDXGIDevice");
+            // Convert to DXGI -> WinRT Device
+            // Fixed: Correctly query interface
+            com_ptr<IDXGIDevice> dxgiDevice;
+            hr = d3d11Device->QueryInterface(__uuidof(IDXGIDevice), dxgiDevice.put_void());
+            if (FAILED(hr)) return false;
+
+            device = CreateWinRTDevice(dxgiDevice.get());
+            if (!device) return false;
+
+            // 2. Create Capture Item
+            hwnd = targetHwnd;
+            if (!CreateCaptureItem()) return false;
+
+            // 3. Setup ROI & 4. Prepare Staging Texture
+            req_x = cropX;
+            req_y = cropY;
+            req_w = cropW;
+            req_h = cropH;
+            center_roi = (flags & CAPTURE_FLAG_CENTER_ROI) != 0;
+            lastSize = item.Size();
+
+            if (!ApplyRoi(lastSize.Width, lastSize.Height)) return false;
+
+            // 5. & 6. Create FramePool & Session, start capturing
+            StartSession();
+            return true;
+
+        }
+        catch (...) {
+            return false;
+        }
     }
 
-    if (pFunc) {
-        IInspectable* pInspectable = nullptr;
-        if (SUCCEEDED(pFunc(dxgi_device, &pInspectable))) {
-            WGD3D::IDirect3DDevice device = { nullptr };
-            winrt::attach_abi(device, pInspectable);
-            return device;
+    // Rebuild the capture item / frame pool / session after a stall (exclusive fullscreen,
+    // alt-tab, hung target) without recreating the D3D device.
+    bool Restart() {
+        if (!device) return false;
+
+        try {
+            CloseSession();
+            if (!CreateCaptureItem()) return false;
+
+            {
+                std::lock_guard<std::mutex> lock(mtx);
+                hasNewFrame = false;
+
+                auto size = item.Size();
+                if (size.Width != lastSize.Width || size.Height != lastSize.Height) {
+                    lastSize = size;
+                    if (!ApplyRoi(size.Width, size.Height)) return false;
+                    resizeCount++;
+                }
+            }
+
+            StartSession();
+            restartCount++;
+            return true;
+        }
+        catch (...) {
+            return false;
         }
     }
-    return nullptr;
-}
 
-// ====================================================
-// Export 1: InitCapture
-// ====================================================
-extern "C" __declspec(dllexport) bool InitCapture(HWND hwnd, int cropX, int cropY, int cropW, int cropH) {
-    if (g_Manager) g_Manager->Cleanup();
-    g_Manager = std::make_unique<CaptureManager>();
+    bool GetLatestFrame(uint8_t* outputBuffer, int bufferSize) {
+        if (!hasNewFrame) return false;
 
-    try {
-        // 1. Initialize D3D11
-        HRESULT hr = D3D11CreateDevice(nullptr, D3D_DRIVER_TYPE_HARDWARE, nullptr, D3D11_CREATE_DEVICE_BGRA_SUPPORT, nullptr, 0, D3D11_SDK_VERSION, &g_Manager->d3d11Device, nullptr, &g_Manager->d3d11Context);
-        if (FAILED(hr)) return false;
+        std::lock_guard<std::mutex> lock(mtx);
+        if (!hasNewFrame || !stagingTexture) return false;
 
-        // Convert to DXGI -> WinRT Device
-        // Fixed: Correctly query interface
-        com_ptr<IDXGIDevice> dxgiDevice;
-        hr = g_Manager->d3d11Device->QueryInterface(__uuidof(IDXGIDevice), dxgiDevice.put_void());
-        if (FAILED(hr)) return false;
+        D3D11_MAPPED_SUBRESOURCE mapped;
+        if (SUCCEEDED(d3d11Context->Map(stagingTexture, 0, D3D11_MAP_READ, 0, &mapped))) {
 
-        auto device = CreateWinRTDevice(dxgiDevice.get());
-        if (!device) return false;
+            uint8_t* src = static_cast<uint8_t*>(mapped.pData);
+            uint8_t* dst = outputBuffer;
 
-        // 2. Create Capture Item
-        auto activation_factory = get_activation_factory<WGC::GraphicsCaptureItem>();
-        auto interop_factory = activation_factory.as<IGraphicsCaptureItemInterop>();
-        check_hresult(interop_factory->CreateForWindow(hwnd, winrt::guid_of<WGC::GraphicsCaptureItem>(), winrt::put_abi(g_Manager->item)));
+            int h = roi_h;
+            int w = roi_w;
+            int rowBytes = w * 4;
 
-        if (!g_Manager->item) return false;
+            // Exact match: after a resize the caller must pick up the new ROI (GetCaptureInfo) first
+            if (bufferSize != h * rowBytes) {
+                d3d11Context->Unmap(stagingTexture, 0);
+                return false;
+            }
+
+            // Copy Row by Row
+            for (int y = 0; y < h; ++y) {
+                memcpy(dst + (y * rowBytes), src + (y * mapped.RowPitch), rowBytes);
+            }
 
-        // 3. Setup ROI
-        if (cropW > 0 && cropH > 0) {
-            g_Manager->use_roi = true;
-            g_Manager->roi_x = cropX;
-            g_Manager->roi_y = cropY;
-            g_Manager->roi_w = cropW;
-            g_Manager->roi_h = cropH;
+            d3d11Context->Unmap(stagingTexture, 0);
+            return true;
         }
-        else {
-            g_Manager->use_roi = false;
-            g_Manager->roi_w = g_Manager->item.Size().Width;
-            g_Manager->roi_h = g_Manager->item.Size().Height;
+        return false;
+    }
+
+    void GetInfo(CaptureInfo* info) {
+        std::lock_guard<std::mutex> lock(mtx);
+        info->contentW = lastSize.Width;
+        info->contentH = lastSize.Height;
+        info->roiX = roi_x;
+        info->roiY = roi_y;
+        info->roiW = roi_w;
+        info->roiH = roi_h;
+        info->resizeCount = resizeCount;
+        info->restartCount = restartCount;
+        info->frameCount = frameCount;
+    }
+
+private:
+    // Compute the ROI for a surface of the given size and (re)allocate the staging texture.
+    // Centred ROIs keep their requested size (clamped to the surface) and stay centred;
+    // fixed ROIs are clamped so they never fall off the surface. Caller must hold mtx.
+    bool ApplyRoi(int surfaceW, int surfaceH) {
+        int x = 0, y = 0, w = surfaceW, h = surfaceH;
+        if (req_w > 0 && req_h > 0) {
+            w = (std::min)(req_w, surfaceW);
+            h = (std::min)(req_h, surfaceH);
+            if (center_roi) {
+                x = (surfaceW - w) / 2;
+                y = (surfaceH - h) / 2;
+            }
+            else {
+                x = (std::min)((std::max)(req_x, 0), surfaceW - w);
+                y = (std::min)((std::max)(req_y, 0), surfaceH - h);
+            }
         }
+        if (w <= 0 || h <= 0) return false;
+
+        use_roi = !(x == 0 && y == 0 && w == surfaceW && h == surfaceH);
+        roi_x = x;
+        roi_y = y;
+
+        if (stagingTexture && w == roi_w && h == roi_h) return true;
+        roi_w = w;
+        roi_h = h;
 
-        // 4. Prepare Staging Texture (CPU Readable)
+        if (stagingTexture) { stagingTexture->Release(); stagingTexture = nullptr; }
+
+        // Prepare Staging Texture (CPU Readable)
         D3D11_TEXTURE2D_DESC desc = {};
-        desc.Width = g_Manager->roi_w;
-        desc.Height = g_Manager->roi_h;
+        desc.Width = roi_w;
+        desc.Height = roi_h;
         desc.MipLevels = 1;
         desc.ArraySize = 1;
         desc.Format = DXGI_FORMAT_B8G8R8A8_UNORM;
@@ -148,102 +299,204 @@ extern "C" __declspec(dllexport) bool InitCapture(HWND hwnd, int cropX, int crop
         desc.CPUAccessFlags = D3D11_CPU_ACCESS_READ;
         desc.BindFlags = 0;
 
-        hr = g_Manager->d3d11Device->CreateTexture2D(&desc, nullptr, &g_Manager->stagingTexture);
-        if (FAILED(hr)) return false;
+        return SUCCEEDED(d3d11Device->CreateTexture2D(&desc, nullptr, &stagingTexture));
+    }
 
-        // 5. Create FramePool & Session
-        g_Manager->framePool = WGC::Direct3D11CaptureFramePool::CreateFreeThreaded(device, WGD::DirectXPixelFormat::B8G8R8A8UIntNormalized, 1, g_Manager->item.Size());
-        g_Manager->session = g_Manager->framePool.CreateCaptureSession(g_Manager->item);
+    // Create the capture item for hwnd
+    bool CreateCaptureItem() {
+        auto activation_factory = get_activation_factory<WGC::GraphicsCaptureItem>();
+        auto interop_factory = activation_factory.as<IGraphicsCaptureItemInterop>();
+        check_hresult(interop_factory->CreateForWindow(hwnd, winrt::guid_of<WGC::GraphicsCaptureItem>(), winrt::put_abi(item)));
+
+        return static_cast<bool>(item);
+    }
+
+    // Create FramePool & Session on the existing device and start capturing
+    void StartSession() {
+        winrt::Windows::Graphics::SizeInt32 poolSize;
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            poolSize = lastSize;
+        }
+        framePool = WGC::Direct3D11CaptureFramePool::CreateFreeThreaded(device, kPixelFormat, 1, poolSize);
+        session = framePool.CreateCaptureSession(item);
 
         // Try to disable border (Yellow border)
         try {
-            g_Manager->session.IsBorderRequired(false);
+            session.IsBorderRequired(false);
         }
         catch (...) {}
 
-        // 6. Frame Arrived Callback
-        g_Manager->framePool.FrameArrived([&](WGC::Direct3D11CaptureFramePool const& sender, winrt::Windows::Foundation::IInspectable const&) {
-            auto frame = sender.TryGetNextFrame();
-            if (!frame) return;
-
-            auto surface = frame.Surface();
-            auto surfaceInterop = surface.as<IDirect3DDxgiInterfaceAccess>();
-            com_ptr<ID3D11Texture2D> tex2d;
-            surfaceInterop->GetInterface(winrt::guid_of<ID3D11Texture2D>(), put_abi(tex2d));
-
-            if (tex2d && g_Manager->stagingTexture) {
-                std::lock_guard<std::mutex> lock(g_Manager->mtx);
-
-                if (g_Manager->use_roi) {
-                    D3D11_BOX sourceRegion;
-                    sourceRegion.left = g_Manager->roi_x;
-                    sourceRegion.top = g_Manager->roi_y;
-                    sourceRegion.front = 0;
-                    sourceRegion.right = g_Manager->roi_x + g_Manager->roi_w;
-                    sourceRegion.bottom = g_Manager->roi_y + g_Manager->roi_h;
-                    sourceRegion.back = 1;
-
-                    // GPU Crop
-                    g_Manager->d3d11Context->CopySubresourceRegion(g_Manager->stagingTexture, 0, 0, 0, 0, tex2d.get(), 0, &sourceRegion);
-                }
-                else {
-                    // Full Copy
-                    g_Manager->d3d11Context->CopyResource(g_Manager->stagingTexture, tex2d.get());
-                }
+        std::weak_ptr<CaptureManager> weak = weak_from_this();
+        frameArrivedToken = framePool.FrameArrived([weak](WGC::Direct3D11CaptureFramePool const& sender, winrt::Windows::Foundation::IInspectable const& args) {
+            auto self = weak.lock();
+            if (!self) return;
+            try {
+                self->OnFrameArrived(sender, args);
+            }
+            catch (...) {} // pool closed underneath us (CloseSession / Restart)
+        });
+        session.StartCapture();
+    }
 
-                g_Manager->hasNewFrame = true;
+    // Frame Arrived Callback
+    void OnFrameArrived(WGC::Direct3D11CaptureFramePool const& sender, winrt::Windows::Foundation::IInspectable const&) {
+        auto frame = sender.TryGetNextFrame();
+        if (!frame) return;
+
+        // Window resized / resolution switched: recreate the pool in place (same device, same session)
+        // and re-apply the ROI. This frame still carries the old surface size, so drop it.
+        // lastSize is also written by Restart on the caller's thread, so compare and update under mtx
+        auto contentSize = frame.ContentSize();
+        WGD3D::IDirect3DDevice poolDevice = { nullptr };
+        {
+            std::lock_guard<std::mutex> lock(mtx);
+            if (contentSize.Width != lastSize.Width || contentSize.Height != lastSize.Height) {
+                if (contentSize.Width <= 0 || contentSize.Height <= 0) return;
+                if (!d3d11Device) return; // Cleanup already ran
+                lastSize = contentSize;
+                hasNewFrame = false;
+                ApplyRoi(contentSize.Width, contentSize.Height);
+                resizeCount++;
+                poolDevice = device;
             }
-            });
+        }
+        if (poolDevice) {
+            sender.Recreate(poolDevice, kPixelFormat, 1, contentSize);
+            return;
+        }
 
-        g_Manager->session.StartCapture();
-        return true;
+        auto surface = frame.Surface();
+        auto surfaceInterop = surface.as<IDirect3DDxgiInterfaceAccess>();
+        com_ptr<ID3D11Texture2D> tex2d;
+        surfaceInterop->GetInterface(winrt::guid_of<ID3D11Texture2D>(), put_abi(tex2d));
+
+        if (tex2d) {
+            std::lock_guard<std::mutex> lock(mtx);
+            if (!stagingTexture || !d3d11Context) return; // Cleanup already ran
+
+            if (use_roi) {
+                D3D11_BOX sourceRegion;
+                sourceRegion.left = roi_x;
+                sourceRegion.top = roi_y;
+                sourceRegion.front = 0;
+                sourceRegion.right = roi_x + roi_w;
+                sourceRegion.bottom = roi_y + roi_h;
+                sourceRegion.back = 1;
+
+                // GPU Crop
+                d3d11Context->CopySubresourceRegion(stagingTexture, 0, 0, 0, 0, tex2d.get(), 0, &sourceRegion);
+            }
+            else {
+                // Full Copy
+                d3d11Context->CopyResource(stagingTexture, tex2d.get());
+            }
 
+            hasNewFrame = true;
+            frameCount++;
+        }
     }
-    catch (...) {
-        return false;
-    }
-}
+};
 
-// ====================================================
-// Export 2: GetLatestFrame
-// ====================================================
-extern "C" __declspec(dllexport) bool GetLatestFrame(uint8_t* outputBuffer, int bufferSize) {
-    if (!g_Manager || !g_Manager->hasNewFrame) return false;
+// Legacy single-session state (InitCapture / GetLatestFrame / ... / CleanupCapture)
+static std::shared_ptr<CaptureManager> g_Manager;
 
-    std::lock_guard<std::mutex> lock(g_Manager->mtx);
+// Multi-session state (OpenCapture / *For / CloseCapture)
+static std::mutex g_SessionsMtx;
+static std::unordered_map<int, std::shared_ptr<CaptureManager>> g_Sessions;
+static int g_NextSessionId = 1;
 
-    D3D11_MAPPED_SUBRESOURCE mapped;
-    if (SUCCEEDED(g_Manager->d3d11Context->Map(g_Manager->stagingTexture, 0, D3D11_MAP_READ, 0, &mapped))) {
+static std::shared_ptr<CaptureManager> FindSession(int id) {
+    std::lock_guard<std::mutex> lock(g_SessionsMtx);
+    auto it = g_Sessions.find(id);
+    return it != g_Sessions.end() ? it->second : nullptr;
+}
 
-        uint8_t* src = static_cast<uint8_t*>(mapped.pData);
-        uint8_t* dst = outputBuffer;
+// ====================================================
+// Export 1: InitCapture / InitCaptureEx
+// ====================================================
+extern "C" __declspec(dllexport) bool InitCaptureEx(HWND hwnd, int cropX, int cropY, int cropW, int cropH, int flags) {
+    if (g_Manager) g_Manager->Cleanup();
+    g_Manager = std::make_shared<CaptureManager>();
+    return g_Manager->Init(hwnd, cropX, cropY, cropW, cropH, flags);
+}
 
-        int h = g_Manager->roi_h;
-        int w = g_Manager->roi_w;
-        int rowBytes = w * 4;
+extern "C" __declspec(dllexport) bool InitCapture(HWND hwnd, int cropX, int cropY, int cropW, int cropH) {
+    return InitCaptureEx(hwnd, cropX, cropY, cropW, cropH, 0);
+}
 
-        if (bufferSize < h * rowBytes) {
-            g_Manager->d3d11Context->Unmap(g_Manager->stagingTexture, 0);
-            return false;
-        }
+// ====================================================
+// Export 2: RestartCapture
+// ====================================================
+extern "C" __declspec(dllexport) bool RestartCapture() {
+    return g_Manager && g_Manager->Restart();
+}
 
-        // Copy Row by Row
-        for (int y = 0; y < h; ++y) {
-            memcpy(dst + (y * rowBytes), src + (y * mapped.RowPitch), rowBytes);
-        }
+// ====================================================
+// Export 3: GetLatestFrame
+// ====================================================
+extern "C" __declspec(dllexport) bool GetLatestFrame(uint8_t* outputBuffer, int bufferSize) {
+    return g_Manager && g_Manager->GetLatestFrame(outputBuffer, bufferSize);
+}
 
-        g_Manager->d3d11Context->Unmap(g_Manager->stagingTexture, 0);
-        return true;
-    }
-    return false;
+// ====================================================
+// Export 4: GetCaptureInfo
+// ====================================================
+extern "C" __declspec(dllexport) bool GetCaptureInfo(CaptureInfo* info) {
+    if (!g_Manager || !info) return false;
+    g_Manager->GetInfo(info);
+    return true;
 }
 
 // ====================================================
-// Export 3: CleanupCapture (Renamed to avoid conflict)
+// Export 5: CleanupCapture (Renamed to avoid conflict)
 // ====================================================
 extern "C" __declspec(dllexport) void CleanupCapture() {
     if (g_Manager) {
         g_Manager->Cleanup();
         g_Manager = nullptr;
     }
-}
\ No newline at end of file
+}
+// ====================================================
+// Export 6: Multi-session API
+// Each handle owns an independent session (own D3D device, pool, staging texture),
+// so many windows can stay warm at the same time. Returns 0 on failure.
+// ====================================================
+extern "C" __declspec(dllexport) int OpenCapture(HWND hwnd, int cropX, int cropY, int cropW, int cropH, int flags) {
+    auto manager = std::make_shared<CaptureManager>();
+    if (!manager->Init(hwnd, cropX, cropY, cropW, cropH, flags)) return 0;
+
+    std::lock_guard<std::mutex> lock(g_SessionsMtx);
+    int id = g_NextSessionId++;
+    g_Sessions[id] = manager;
+    return id;
+}
+
+extern "C" __declspec(dllexport) bool RestartCaptureFor(int id) {
+    auto manager = FindSession(id);
+    return manager && manager->Restart();
+}
+
+extern "C" __declspec(dllexport) bool GetLatestFrameFor(int id, uint8_t* outputBuffer, int bufferSize) {
+    auto manager = FindSession(id);
+    return manager && manager->GetLatestFrame(outputBuffer, bufferSize);
+}
+
+extern "C" __declspec(dllexport) bool GetCaptureInfoFor(int id, CaptureInfo* info) {
+    auto manager = FindSession(id);
+    if (!manager || !info) return false;
+    manager->GetInfo(info);
+    return true;
+}
+
+extern "C" __declspec(dllexport) void CloseCapture(int id) {
+    std::shared_ptr<CaptureManager> manager;
+    {
+        std::lock_guard<std::mutex> lock(g_SessionsMtx);
+        auto it = g_Sessions.find(id);
+        if (it == g_Sessions.end()) return;
+        manager = it->second;
+        g_Sessions.erase(it);
+    }
+    manager->Cleanup();
+}
@@ -0,0 +1,78 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 在全新的 Python 程序中量測 import 時間 (避免模組快取影響)
+_IMPORT_SNIPPET = """
+import time
+t = time.perf_counter()
+{stmt}
+print(time.perf_counter() - t)
+"""
+
+
+def measure_import(stmt, runs):
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_SNIPPET.format(stmt=stmt)],
+                             cwd=HERE, capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def measure_first_frame(make_driver, hwnd, runs):
+    """從 init_session 到拿到第一張畫面的時間 (含 DLL session 建立與等待第一幀)"""
+    times = []
+    for _ in range(runs):
+        driver = make_driver()
+        t = time.perf_counter()
+        driver.init_session(hwnd, "window")
+        frame = driver.capture_raw()
+        while frame is None and time.perf_counter() - t < 5.0:
+            frame = driver.capture_raw()
+        elapsed = time.perf_counter() - t
+        driver.release()
+        if frame is None:
+            print("  [!] 5 秒內沒有拿到畫面")
+            continue
+        times.append(elapsed)
+    return times
+
+
+def _report(name, times):
+    if not times:
+        print(f"{name:<32} -")
+        return
+    print(f"{name:<32} median={statistics.median(times) * 1000:7.1f}ms  "
+          f"min={min(times) * 1000:7.1f}ms  max={max(times) * 1000:7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="量測 wgc_driver 的 import 時間與第一幀時間")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--hwnd", type=lambda s: int(s, 0), help="量測真實視窗 (不指定則使用模擬來源)")
+    parser.add_argument("--fps", type=float, default=60.0, help="模擬來源的 FPS")
+    args = parser.parse_args()
+
+    print(f"=== Import 時間 ({args.runs} 次，各自獨立程序) ===")
+    _report("import wgc_driver", measure_import("import wgc_driver", args.runs))
+    _report("import numpy, PIL, cv2", measure_import("import numpy, PIL.Image, cv2", args.runs))
+
+    print(f"\n=== 第一幀時間 ({args.runs} 次) ===")
+    if args.hwnd:
+        from wgc_driver import WGCDriver
+        times = measure_first_frame(WGCDriver, args.hwnd, args.runs)
+        _report(f"WGCDriver {args.hwnd:#x}", times)
+    else:
+        from wgc_sim import SimulatedWGCDriver
+        times = measure_first_frame(lambda: SimulatedWGCDriver(1280, 720, fps=args.fps), 1, args.runs)
+        _report(f"SimulatedWGCDriver {args.fps:g}fps", times)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,14 @@ setup(
     long_description_content_type='text/markdown',
     url='https://github.com/4Games/screenshot_lib/WGC',
     packages=find_packages(),
+    py_modules=['wgc_driver', 'wgc_sim', 'wgc_server', 'wgc_scheduler'],
+    # WGC.dll 安裝到 <prefix>/share/wgc-screenshot，wgc_driver 會在這裡找 (見 DLL_SEARCH_PATHS)
+    data_files=[('share/wgc-screenshot', ['libs/WGC.dll'])],
+    entry_points={
+        'console_scripts': [
+            'wgc=wgc_server:main',
+        ],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
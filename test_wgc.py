@@ -70,22 +70,7 @@ class FPS_WGCDriver(WGCDriver):
             return False
         
         # 2. 根據模式計算 ROI
-        if self.custom_mode == "CENTER":
-            # FPS 模式：只取中心
-            # 確保裁切框不會比視窗還大
-            valid_crop_w = min(win_w, self.target_crop_w)
-            valid_crop_h = min(win_h, self.target_crop_h)
-            
-            self.roi_w = valid_crop_w
-            self.roi_h = valid_crop_h
-            self.roi_x = (win_w - self.roi_w) // 2
-            self.roi_y = (win_h - self.roi_h) // 2
-        else:
-            # 全螢幕模式
-            self.roi_w = win_w
-            self.roi_h = win_h
-            self.roi_x = 0
-            self.roi_y = 0
+        self.roi_x, self.roi_y, self.roi_w, self.roi_h, mode = self._compute_roi(win_w, win_h)
 
         print(f"[WGC] 初始化模式: {self.custom_mode}")
         print(f"[WGC] 視窗尺寸: {win_w}x{win_h}")
@@ -96,14 +81,25 @@ class FPS_WGCDriver(WGCDriver):
             print("[WGC] Error: DLL not loaded")
             return False
 
-        if self.lib.InitCapture(self.hwnd, self.roi_x, self.roi_y, self.roi_w, self.roi_h):
-            self.is_initialized = True
-            self.buffer_size = self.roi_w * self.roi_h * 4
-            self.buffer = (ctypes.c_uint8 * self.buffer_size)()
-            time.sleep(0.2) # WGC 暖機稍微加長一點
+        if self._start_capture(mode):
+            self._wait_first_frame() # 等到第一幀 (或逾時) 才開始擷取
             return True
         return False
 
+    def _compute_roi(self, w, h):
+        """
+        依 UI 設定計算 ROI。視窗尺寸改變時，DLL 會用同樣的規則重新置中。
+        """
+        if self.custom_mode == "CENTER":
+            # FPS 模式：只取中心
+            # 確保裁切框不會比視窗還大
+            roi_w = min(w, self.target_crop_w)
+            roi_h = min(h, self.target_crop_h)
+            return (w - roi_w) // 2, (h - roi_h) // 2, roi_w, roi_h, "CENTER"
+
+        # 全螢幕模式
+        return 0, 0, w, h, "FULL"
+
 # ==========================================
 # 3. 視窗列表工具
 # ==========================================
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 模組放在專案根目錄 (py_modules)，測試時直接從原始碼匯入
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from wgc_sim import FakeClock, SimulatedWGCDriver
+
+# 比 1/60 稍長，確保每次輪詢都至少有一幀到達 (避免浮點誤差漏掉 tick)
+STEP = 1 / 50
+
+
+def make_driver(width, height):
+    clock = FakeClock()
+    driver = SimulatedWGCDriver(width, height, fps=60.0, clock=clock)
+    events = []
+    driver.add_resize_listener(events.append)
+    return clock, driver, events
+
+
+def run(clock, driver, count):
+    frames = []
+    for _ in range(count):
+        clock.advance(STEP)
+        frames.append(driver.capture_raw())
+    return frames
+
+
+def resize(clock, driver, width, height, count=5):
+    """觸發 resize 並繼續擷取，回傳這段期間的所有 capture 結果"""
+    driver.lib.resize(width, height)
+    return run(clock, driver, count)
+
+
+def assert_roi_content(driver, frame):
+    lib = driver.lib
+    full = lib.render(lib._last_tick)
+    expected = full[driver.roi_y:driver.roi_y + driver.roi_h, driver.roi_x:driver.roi_x + driver.roi_w]
+    np.testing.assert_array_equal(frame, expected)
+
+
+def test_center_roi_recentred():
+    clock, driver, events = make_driver(1280, 720)
+    frame = driver.capture_raw()
+    assert frame.shape == (640, 640, 4)
+    assert (driver.roi_x, driver.roi_y) == (320, 40)
+
+    frames = resize(clock, driver, 1920, 1080)
+    assert (driver.roi_x, driver.roi_y, driver.roi_w, driver.roi_h) == (640, 220, 640, 640)
+    assert frames[-1].shape == (640, 640, 4)
+    assert_roi_content(driver, frames[-1])
+    assert events == [{'old_size': (1280, 720), 'new_size': (1920, 1080), 'roi': (640, 220, 640, 640)}]
+
+
+def test_full_buffer_reallocated():
+    clock, driver, events = make_driver(600, 400)
+    assert driver.capture_raw().shape == (400, 600, 4)
+    old_buffer = driver.buffer
+
+    frames = resize(clock, driver, 500, 300)
+    assert frames[-1].shape == (300, 500, 4)
+    assert driver.buffer is not old_buffer
+    assert driver.buffer_size == 500 * 300 * 4
+    assert_roi_content(driver, frames[-1])
+    assert events == [{'old_size': (600, 400), 'new_size': (500, 300), 'roi': (0, 0, 500, 300)}]
+
+
+@pytest.mark.parametrize("start,end", [
+    ((1280, 720), (1920, 1080)),   # CENTER -> CENTER
+    ((600, 400), (500, 300)),      # FULL -> FULL
+    ((600, 400), (1920, 1080)),    # FULL -> CENTER
+    ((1920, 1080), (600, 400)),    # CENTER -> FULL
+])
+def test_at_most_one_frame_dropped(start, end):
+    clock, driver, events = make_driver(*start)
+    assert all(frame is not None for frame in run(clock, driver, 5))
+
+    frames = resize(clock, driver, *end, count=10)
+    assert sum(frame is None for frame in frames) <= 1
+    assert frames[-1] is not None
+    assert len(events) == 1
+
+
+def test_mode_change_reinitializes():
+    # 600x400 是 FULL；放大到 1920x1080 後要改成中央 640x640，而不是串流整個畫面
+    clock, driver, events = make_driver(600, 400)
+    assert driver.capture_raw().shape == (400, 600, 4)
+
+    frames = resize(clock, driver, 1920, 1080)
+    assert frames[-1].shape == (640, 640, 4)
+    assert (driver.roi_x, driver.roi_y, driver.roi_w, driver.roi_h) == (640, 220, 640, 640)
+    assert driver.lib.center_roi
+    assert_roi_content(driver, frames[-1])
+    assert events == [{'old_size': (600, 400), 'new_size': (1920, 1080), 'roi': (640, 220, 640, 640)}]
+
+    # 之後再縮放由 DLL 自己重新置中，不需要再重新初始化
+    frames = resize(clock, driver, 1280, 720)
+    assert (driver.roi_x, driver.roi_y) == (320, 40)
+    assert_roi_content(driver, frames[-1])
+
+    # 縮小到 640 以下則回到 FULL
+    frames = resize(clock, driver, 800, 600)
+    assert frames[-1].shape == (600, 800, 4)
+    assert not driver.lib.center_roi
+    assert events[-1]['roi'] == (0, 0, 800, 600)
+
+
+def test_frame_count_keeps_increasing_across_reinit():
+    clock, driver, events = make_driver(600, 400)
+    counts = []
+    for _ in range(5):
+        clock.advance(STEP)
+        driver.capture_raw()
+        counts.append(driver.frame_count)
+    driver.lib.resize(1920, 1080)
+    for _ in range(5):
+        clock.advance(STEP)
+        driver.capture_raw()
+        counts.append(driver.frame_count)
+    assert counts == sorted(counts)
+    assert counts[-1] > counts[4]
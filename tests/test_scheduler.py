@@ -0,0 +1,214 @@
+import threading
+
+import pytest
+
+from wgc_scheduler import SnapshotScheduler
+from wgc_sim import FakeClock, SimulatedWGCDriver
+
+
+class ControlledDriver(SimulatedWGCDriver):
+    """capture_raw 會等 gate 開啟，並可讓假時鐘前進 cost 秒 (模擬截圖耗時)"""
+    def __init__(self, clock, gate, cost=0.0, released=None):
+        super().__init__(64, 64, clock=clock)
+        self.clock = clock
+        self.gate = gate
+        self.cost = cost
+        self.released = released
+
+    def capture_raw(self):
+        assert self.gate.wait(5.0)
+        if self.cost:
+            self.clock.advance(self.cost)
+        return super().capture_raw()
+
+    def release(self):
+        if self.released is not None:
+            self.released.append(self)
+        super().release()
+
+
+@pytest.fixture
+def env():
+    clock = FakeClock()
+    gate = threading.Event()
+    gate.set()
+    created, released = [], []
+    costs = {}
+
+    def factory(target):
+        driver = ControlledDriver(clock, gate, costs.get(target.name, 0.0), released)
+        created.append(driver)
+        return driver
+
+    schedulers = []
+
+    def make(**kwargs):
+        scheduler = SnapshotScheduler(factory, clock=clock, **kwargs)
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield clock, gate, make, created, released, costs
+    gate.set()
+    for scheduler in schedulers:
+        scheduler.stop()
+
+
+def tick(scheduler):
+    scheduler.run_pending()
+    assert scheduler.wait_idle(5.0)
+
+
+def test_first_shots_succeed_and_sessions_stay_warm(env):
+    clock, gate, make, created, released, costs = env
+    scheduler = make(max_workers=2)
+    scheduler.add_target("a", 1, 1.0)
+    scheduler.add_target("b", 2, 1.0)
+    for _ in range(3):
+        tick(scheduler)
+        clock.advance(1.0)
+
+    stats = scheduler.stats()
+    assert stats['shots'] == 6
+    assert stats['failures'] == 0
+    assert len(created) == 2
+
+
+def test_max_workers_limits_concurrency(env):
+    clock, gate, make, created, released, costs = env
+    scheduler = make(max_workers=2)
+    for i in range(3):
+        scheduler.add_target(f"t{i}", i + 1, 10.0)
+
+    gate.clear()
+    scheduler.run_pending()
+    stats = scheduler.stats()
+    assert stats['running'] == 2
+    assert stats['queued'] == 3   # 兩個已重新排程 + 一個在 ready 等 worker
+
+    gate.set()
+    assert scheduler.wait_idle(5.0)
+    tick(scheduler)
+    assert scheduler.stats()['shots'] == 3
+
+
+def test_in_flight_slots_are_coalesced(env):
+    clock, gate, make, created, released, costs = env
+    scheduler = make(max_workers=1)
+    scheduler.add_target("a", 1, 1.0)
+
+    gate.clear()
+    scheduler.run_pending()
+    for _ in range(2):
+        clock.advance(1.0)
+        scheduler.run_pending()
+    gate.set()
+    assert scheduler.wait_idle(5.0)
+
+    target = scheduler.stats()['targets']['a']
+    assert target['shots'] == 1
+    assert target['coalesced'] == 2
+    assert target['next_due'] == pytest.approx(3.0)
+
+
+def test_missed_deadline_is_reported(env):
+    clock, gate, make, created, released, costs = env
+    missed = []
+    scheduler = make(max_workers=2, tolerance=0.5, on_missed=lambda name, late: missed.append((name, late)))
+    costs.update(slow=1.0, fast=0.2)
+    # 錯開執行，避免兩個 worker 同時推進共用的假時鐘
+    scheduler.add_target("slow", 1, 60.0, first_due=0.0)
+    scheduler.add_target("fast", 2, 60.0, first_due=10.0)
+    tick(scheduler)
+    clock.advance(10.0 - clock())
+    tick(scheduler)
+
+    stats = scheduler.stats()['targets']
+    assert stats['slow']['missed'] == 1
+    assert stats['fast']['missed'] == 0
+    assert [name for name, _ in missed] == ["slow"]
+    assert missed[0][1] > 0.5
+
+
+def test_priority_wins_when_workers_are_saturated(env):
+    clock, gate, make, created, released, costs = env
+    order = []
+    scheduler = make(max_workers=1, on_snapshot=lambda name, frame: order.append(name))
+    scheduler.add_target("low", 1, 10.0, priority=0, first_due=0.0)
+    scheduler.add_target("high", 2, 10.0, priority=5, first_due=0.000001)
+    clock.advance(1.0)
+    for _ in range(2):
+        tick(scheduler)
+    assert order == ["high", "low"]
+
+
+def test_remove_during_shot_releases_session(env):
+    clock, gate, make, created, released, costs = env
+    scheduler = make(max_workers=1)
+    scheduler.add_target("a", 1, 1.0)
+
+    gate.clear()
+    scheduler.run_pending()
+    scheduler.remove_target("a")
+    gate.set()
+    assert scheduler.wait_idle(5.0)
+
+    assert len(created) == 1
+    assert released == created
+
+
+def test_replace_during_shot_hands_over_after_finish(env):
+    clock, gate, make, created, released, costs = env
+    scheduler = make(max_workers=2)
+    scheduler.add_target("a", 1, 1.0)
+
+    gate.clear()
+    scheduler.run_pending()
+    scheduler.add_target("a", 1, 2.0)
+    assert scheduler.stats()['targets']['a']['warm'] is False
+    gate.set()
+    assert scheduler.wait_idle(5.0)
+
+    tick(scheduler)
+    assert len(created) == 1
+    assert released == []
+    assert scheduler.stats()['targets']['a']['shots'] == 1
+
+
+def test_legacy_dll_shots_run_one_at_a_time(env):
+    clock, gate, make, created, released, costs = env
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    class LegacyDriver(ControlledDriver):
+        def capture_raw(self):
+            with lock:
+                active.append(self)
+                peak.append(len(active))
+            try:
+                assert not self.is_initialized
+                return super().capture_raw()
+            finally:
+                with lock:
+                    active.remove(self)
+
+    def factory(target):
+        driver = LegacyDriver(clock, gate, released=released)
+        driver.supports_sessions = False
+        created.append(driver)
+        return driver
+
+    scheduler = SnapshotScheduler(factory, max_workers=3, clock=clock)
+    try:
+        for i in range(3):
+            scheduler.add_target(f"t{i}", i + 1, 1.0)
+        for _ in range(2):
+            tick(scheduler)
+            clock.advance(1.0)
+    finally:
+        scheduler.stop()
+
+    assert max(peak) == 1
+    assert scheduler.stats()['shots'] == 6
+    # 每張截完都 Cleanup，不留任何全域 session
+    assert all(not driver.is_initialized for driver in created)
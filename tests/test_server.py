@@ -0,0 +1,205 @@
+import socket
+import time
+
+import numpy as np
+import pytest
+
+from wgc_server import (MSG_DELTA, MSG_KEYFRAME, FrameClient, FrameServer, TileDeltaDecoder,
+                        TileDeltaEncoder, apply_view)
+from wgc_sim import SimulatedWGCDriver
+
+
+class StaticSource:
+    """每次都回傳同一張 BGRA 幀，方便比對客戶端還原的內容"""
+    def __init__(self, frame):
+        self.frame = frame
+
+    def capture_raw(self):
+        return self.frame
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(source, **kwargs):
+        server = FrameServer(source, ("127.0.0.1", 0), **kwargs)
+        server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+# ==========================================
+# Tile 差分編碼
+# ==========================================
+@pytest.mark.parametrize("width,height,tile", [(100, 70, 32), (64, 64, 16), (33, 17, 8)])
+def test_codec_round_trip_random_changes(width, height, tile):
+    rng = np.random.default_rng(width * height)
+    encoder = TileDeltaEncoder(tile, keyframe_interval=1000)
+    decoder = TileDeltaDecoder()
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    msg_type, payload = encoder.encode(frame)
+    assert msg_type == MSG_KEYFRAME
+    np.testing.assert_array_equal(decoder.decode(msg_type, width, height, tile, payload), frame)
+
+    types = []
+    for _ in range(50):
+        frame = frame.copy()
+        # 每次改幾個小區塊，包含貼著右/下邊緣、落在補零 tile 裡的位置
+        for _ in range(rng.integers(0, 4)):
+            x, y = rng.integers(0, width), rng.integers(0, height)
+            w, h = rng.integers(1, tile + 1), rng.integers(1, tile + 1)
+            frame[y:y + h, x:x + w] = rng.integers(0, 256, 3, dtype=np.uint8)
+        msg_type, payload = encoder.encode(frame)
+        types.append(msg_type)
+        np.testing.assert_array_equal(decoder.decode(msg_type, width, height, tile, payload), frame)
+
+    assert MSG_DELTA in types
+
+
+def test_codec_unchanged_frame_sends_empty_delta():
+    encoder = TileDeltaEncoder(32)
+    frame = np.zeros((70, 100, 3), dtype=np.uint8)
+    encoder.encode(frame)
+    msg_type, payload = encoder.encode(frame.copy())
+    assert msg_type == MSG_DELTA
+    assert len(payload) == 4
+
+
+def test_codec_forced_keyframe():
+    rng = np.random.default_rng(0)
+    encoder = TileDeltaEncoder(32, keyframe_interval=1000)
+    decoder = TileDeltaDecoder()
+    frame = rng.integers(0, 256, (70, 100, 3), dtype=np.uint8)
+    decoder.decode(*_encode(encoder, frame))
+
+    encoder.reset()
+    frame = frame.copy()
+    frame[0, 0] ^= 0xFF
+    msg_type, w, h, tile, payload = _encode(encoder, frame)
+    assert msg_type == MSG_KEYFRAME
+    np.testing.assert_array_equal(decoder.decode(msg_type, w, h, tile, payload), frame)
+
+    # keyframe 之後恢復送 delta
+    assert _encode(encoder, frame)[0] == MSG_DELTA
+
+
+def test_codec_keyframe_interval_and_size_change():
+    encoder = TileDeltaEncoder(16, keyframe_interval=3)
+    decoder = TileDeltaDecoder()
+    frame = np.zeros((40, 50, 3), dtype=np.uint8)
+    types = [_encode(encoder, frame)[0] for _ in range(5)]
+    assert types == [MSG_KEYFRAME, MSG_DELTA, MSG_DELTA, MSG_DELTA, MSG_KEYFRAME]
+
+    smaller = np.full((20, 30, 3), 7, dtype=np.uint8)
+    msg_type, w, h, tile, payload = _encode(encoder, smaller)
+    assert msg_type == MSG_KEYFRAME
+    np.testing.assert_array_equal(decoder.decode(msg_type, w, h, tile, payload), smaller)
+
+
+def test_decoder_rejects_delta_without_keyframe():
+    encoder = TileDeltaEncoder(16)
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+    encoder.encode(frame)
+    msg_type, payload = encoder.encode(frame)
+    with pytest.raises(ValueError):
+        TileDeltaDecoder().decode(msg_type, 16, 16, 16, payload)
+
+
+def _encode(encoder, frame):
+    msg_type, payload = encoder.encode(frame)
+    return msg_type, frame.shape[1], frame.shape[0], encoder.tile, payload
+
+
+# ==========================================
+# ROI / 縮放請求
+# ==========================================
+@pytest.mark.parametrize("roi,scale", [((10, 20, 100, 50), 1.0), (None, 0.5), ((150, 100, 500, 500), 0.5)])
+def test_view_request(start_server, roi, scale):
+    frame = np.random.default_rng(1).integers(0, 256, (120, 200, 4), dtype=np.uint8)
+    server = start_server(StaticSource(frame), max_fps=100.0, tile=16)
+    expected = apply_view(frame, roi, scale)
+
+    client = FrameClient(server.address)
+    try:
+        _, received = client.recv_frame()
+        assert received.shape == (120, 200, 3)
+
+        client.set_view(roi, scale)
+        for _ in range(100):
+            _, received = client.recv_frame()
+            if received.shape == expected.shape:
+                break
+        keyframes = client.keyframes
+        np.testing.assert_array_equal(received, expected)
+        # 切換 view 時送 keyframe，之後同一個 view 只送 delta
+        client.recv_frame()
+        assert client.keyframes == keyframes
+    finally:
+        client.close()
+
+
+def test_invalid_request_keeps_connection(start_server):
+    frame = np.zeros((32, 32, 4), dtype=np.uint8)
+    server = start_server(StaticSource(frame), max_fps=100.0, tile=16)
+    client = FrameClient(server.address)
+    try:
+        client.recv_frame()
+        client._send({'scale': 2.0})
+        client._send([1, 2, 3])
+        seq, received = client.recv_frame()
+        assert received.shape == (32, 32, 3)
+        assert server.stats()[0]['scale'] == 1.0
+    finally:
+        client.close()
+
+
+# ==========================================
+# 背壓
+# ==========================================
+def test_non_acking_client_is_dropped_without_slowing_others(start_server):
+    source = SimulatedWGCDriver(160, 120, fps=60.0)
+    server = start_server(source, max_fps=60.0, max_inflight=2)
+
+    # 連線後既不讀也不 ack
+    stalled = socket.create_connection(server.address)
+    assert _wait_until(lambda: len(server.stats()) == 1)
+    client = FrameClient(server.address)
+    try:
+        assert _wait_until(lambda: len(server.stats()) == 2)
+        client.recv_frame()
+
+        captured = server.frames_captured
+        received = 0
+        start = time.monotonic()
+        while time.monotonic() - start < 1.0:
+            assert client.recv_frame() is not None
+            received += 1
+        captured = server.frames_captured - captured
+
+        stats = {s['last_ack'] is None: s for s in server.stats()}
+        slow, fast = stats[True], stats[False]
+        assert slow['frames_sent'] <= 2
+        assert slow['inflight'] == slow['frames_sent']
+        assert slow['dropped'] >= captured - 2
+        # 正常的客戶端幾乎每一幀都收到
+        assert captured >= 30
+        assert received >= captured * 0.8
+        assert fast['inflight'] <= 2
+    finally:
+        client.close()
+        stalled.close()
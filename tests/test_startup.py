@@ -0,0 +1,87 @@
+import pytest
+
+from wgc_driver import WGCDriver
+from wgc_sim import FakeClock, SimulatedWGCDriver, SimulatedWGCLib
+
+
+class LegacyLib:
+    """只有 baseline 三個匯出函式的 DLL (沒有 GetCaptureInfo)"""
+    def __init__(self, lib):
+        self._lib = lib
+
+    def InitCapture(self, hwnd, crop_x, crop_y, crop_w, crop_h):
+        return self._lib.InitCapture(hwnd, crop_x, crop_y, crop_w, crop_h)
+
+    def GetLatestFrame(self, buffer, buffer_size):
+        return self._lib.GetLatestFrame(buffer, buffer_size)
+
+    def CleanupCapture(self):
+        self._lib.CleanupCapture()
+
+
+class LegacyDriver(WGCDriver):
+    def __init__(self, clock, fps=60.0):
+        self.sim = SimulatedWGCLib(320, 240, fps, clock)
+        super().__init__(lib=LegacyLib(self.sim), clock=clock, sleep=clock.sleep)
+        self.hwnd = 1
+
+    def _get_window_size(self):
+        return self.sim.width, self.sim.height
+
+
+def test_returns_as_soon_as_first_frame_arrives():
+    clock = FakeClock()
+    driver = SimulatedWGCDriver(320, 240, fps=60.0, clock=clock)
+    driver.first_frame_timeout = 1.0
+
+    frame = driver.capture_raw()
+
+    assert frame is not None
+    assert driver.time_to_first_frame == pytest.approx(1 / 60, abs=0.002)
+    assert clock() == pytest.approx(1 / 60, abs=0.002)
+
+
+def test_times_out_without_first_frame():
+    clock = FakeClock()
+    # 0.5 fps：第一幀 2 秒後才到
+    driver = SimulatedWGCDriver(320, 240, fps=0.5, clock=clock)
+    driver.first_frame_timeout = 1.0
+
+    assert driver._initialize_wgc()
+    assert driver.time_to_first_frame is None
+    assert 1.0 <= clock() < 1.01
+    assert driver.capture_raw() is None
+
+    clock.advance(1.0)
+    assert driver.capture_raw() is not None
+
+
+def test_zero_timeout_does_not_wait():
+    clock = FakeClock()
+    driver = SimulatedWGCDriver(320, 240, fps=60.0, clock=clock)
+    driver.first_frame_timeout = 0
+
+    assert driver._initialize_wgc()
+    assert clock() == 0.0
+
+
+def test_legacy_dll_polls_get_latest_frame():
+    clock = FakeClock()
+    driver = LegacyDriver(clock)
+    assert not driver.supports_resize
+
+    frame = driver.capture_raw()
+
+    assert frame is not None
+    assert frame.shape == (240, 320, 4)
+    assert driver.time_to_first_frame == pytest.approx(1 / 60, abs=0.002)
+
+
+def test_legacy_dll_times_out():
+    clock = FakeClock()
+    driver = LegacyDriver(clock, fps=0.5)
+    driver.first_frame_timeout = 0.5
+
+    assert driver._initialize_wgc()
+    assert driver.time_to_first_frame is None
+    assert 0.5 <= clock() < 0.51
@@ -0,0 +1,72 @@
+import pytest
+
+from wgc_sim import FakeClock, SimulatedWGCDriver
+
+
+def make_driver(stall_timeout=2.0):
+    clock = FakeClock()
+    driver = SimulatedWGCDriver(320, 240, fps=60.0, clock=clock)
+    watchdog = driver.enable_watchdog(frame_slo=0.1, stall_timeout=stall_timeout, clock=clock)
+    events = []
+    driver.add_stall_listener(lambda event: events.append((clock(), event)))
+    return clock, driver, watchdog, events
+
+
+def run(clock, driver, seconds, step=0.1):
+    for _ in range(int(round(seconds / step))):
+        clock.advance(step)
+        driver.capture_raw()
+
+
+def test_stall_detected_and_recovered():
+    clock, driver, watchdog, events = make_driver()
+    run(clock, driver, 1.0, step=1 / 60)
+    assert watchdog.stats()['stalls'] == 0
+
+    driver.lib.stall()
+    run(clock, driver, 2.5)
+
+    stats = watchdog.stats()
+    assert stats['stalls'] == 1
+    assert stats['recovery_attempts'] == 1
+    assert stats['failed_recoveries'] == 0
+    assert stats['recoveries'] == 1
+    assert stats['slo_violations'] >= 1
+    assert driver.lib.restart_count == 1
+    assert [event['ok'] for _, event in events] == [True]
+    assert not driver.frame_stale
+
+
+def test_failed_restarts_back_off():
+    clock, driver, watchdog, events = make_driver()
+    run(clock, driver, 0.5, step=1 / 60)
+
+    driver.lib.fail_restarts = 2
+    driver.lib.stall()
+    run(clock, driver, 10.0)
+
+    assert [event['ok'] for _, event in events] == [False, False, True]
+    times = [t for t, _ in events]
+    # 退避間隔：stall_timeout 起算，每次失敗加倍
+    assert times[1] - times[0] == pytest.approx(2.0, abs=0.11)
+    assert times[2] - times[1] == pytest.approx(4.0, abs=0.11)
+
+    stats = watchdog.stats()
+    assert stats['recovery_attempts'] == 3
+    assert stats['failed_recoveries'] == 2
+    assert stats['recoveries'] == 1
+    # 第一次嘗試到第一個新幀：2 + 4 秒退避，加上輪詢間隔的誤差
+    assert 6.0 <= stats['last_recovery_time'] <= 6.5
+
+
+def test_transient_stall_does_not_restart():
+    clock, driver, watchdog, events = make_driver()
+    run(clock, driver, 0.5, step=1 / 60)
+
+    driver.lib.stall(duration=0.5)
+    run(clock, driver, 1.0)
+
+    stats = watchdog.stats()
+    assert stats['stalls'] == 0
+    assert stats['slo_violations'] >= 1
+    assert events == []
@@ -1,15 +1,212 @@
 import ctypes
 import os
+import site
+import sys
 from ctypes import wintypes
-import numpy as np
-from PIL import Image
-import cv2
 import time
-from core.interfaces import CaptureController
+from collections import deque
+# numpy / PIL 只在擷取、轉換時才載入 (見 capture_raw / capture)，
+# 讓只需要 Driver 的短命程序啟動更快
+try:
+    from core.interfaces import CaptureController
+except ImportError:
+    # 單獨使用 (不在主專案內) 時沒有 core 套件
+    CaptureController = object
+
+# DLL 搜尋順序 (不受目前工作目錄影響)：
+# 1. 原始碼目錄：與本模組同目錄下的 libs/WGC.dll
+# 2. pip install 後：setup.py 以 data_files 安裝到 <prefix>/share/wgc-screenshot/WGC.dll
+#    (--user 安裝時為 USER_BASE 底下)
+DLL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'libs', 'WGC.dll')
+DLL_SEARCH_PATHS = [DLL_PATH] + [
+    os.path.join(base, 'share', 'wgc-screenshot', 'WGC.dll')
+    for base in (sys.prefix, site.USER_BASE) if base
+]
+
+# InitCaptureEx flags
+CAPTURE_FLAG_CENTER_ROI = 0x1
+
+class CaptureInfo(ctypes.Structure):
+    # 對應 wgc.cpp 的 CaptureInfo
+    _fields_ = [
+        ('content_w', ctypes.c_int),
+        ('content_h', ctypes.c_int),
+        ('roi_x', ctypes.c_int),
+        ('roi_y', ctypes.c_int),
+        ('roi_w', ctypes.c_int),
+        ('roi_h', ctypes.c_int),
+        ('resize_count', ctypes.c_uint),
+        ('restart_count', ctypes.c_uint),
+        ('frame_count', ctypes.c_ulonglong),
+    ]
+
+class _SessionLib:
+    """
+    將 DLL 的多工作階段 API (OpenCapture / *For / CloseCapture) 包裝成
+    原本單一工作階段的函式名稱：每個 WGCDriver 擁有獨立的 session，
+    多個 Driver 可以同時保持擷取 (不會互相 Cleanup 掉)。
+    """
+    def __init__(self, lib):
+        self._lib = lib
+        self.session_id = 0
+
+    def InitCapture(self, hwnd, crop_x, crop_y, crop_w, crop_h):
+        return self.InitCaptureEx(hwnd, crop_x, crop_y, crop_w, crop_h, 0)
+
+    def InitCaptureEx(self, hwnd, crop_x, crop_y, crop_w, crop_h, flags):
+        self.CleanupCapture()
+        self.session_id = self._lib.OpenCapture(hwnd, crop_x, crop_y, crop_w, crop_h, flags)
+        return self.session_id != 0
+
+    def GetLatestFrame(self, buffer, buffer_size):
+        return self._lib.GetLatestFrameFor(self.session_id, buffer, buffer_size)
+
+    def GetCaptureInfo(self, info):
+        return self._lib.GetCaptureInfoFor(self.session_id, info)
+
+    def RestartCapture(self):
+        return self._lib.RestartCaptureFor(self.session_id)
+
+    def CleanupCapture(self):
+        if self.session_id:
+            self._lib.CloseCapture(self.session_id)
+            self.session_id = 0
+
+class StallWatchdog:
+    """
+    追蹤幀與幀之間的間隔 (以 DLL 回報的 frame_count 判斷是否真的有新幀，
+    因為 GetLatestFrame 在停滯時會一直回傳最後一幀)。
+    - 間隔超過 frame_slo (秒)：計入 SLO 違規，目前的幀標記為 stale
+    - 間隔超過 stall_timeout (秒)：判定停滯，要求重建 session；
+      失敗或重建後仍沒有新幀時，以倍數退避重試 (最多 max_backoff 秒)
+
+    注意：WGC 只在畫面有變化時才送幀，靜止的視窗也會被判定為停滯，
+    這類目標請把 stall_timeout 設大，或設為 None (只追蹤不恢復)。
+    """
+    def __init__(self, frame_slo=0.1, stall_timeout=2.0, max_backoff=30.0, clock=time.monotonic, history=1000):
+        self.frame_slo = frame_slo
+        self.stall_timeout = stall_timeout
+        self.max_backoff = max_backoff
+        self.clock = clock
+
+        self.frames = 0
+        self.slo_violations = 0
+        self.max_gap = 0.0
+        self.stalls = 0
+        self.recovery_attempts = 0
+        self.failed_recoveries = 0
+        self.recoveries = 0
+        self.last_recovery_time = None
+        self.max_recovery_time = 0.0
+        self.total_recovery_time = 0.0
+        self._gaps = deque(maxlen=history)
+        self.reset()
+
+    def reset(self):
+        """重新開始追蹤 (session 初始化後呼叫)，統計數字保留"""
+        self.stale = False
+        self._last_count = None
+        self._last_time = None
+        self._stalled = False
+        self._recover_start = None
+        self._next_attempt = 0.0
+        self._backoff = self.stall_timeout or 0.0
+
+    def observe(self, frame_count):
+        """每次擷取時呼叫；回傳 True 表示應該重建 session"""
+        now = self.clock()
+        if self._last_count is None:
+            self._last_count = frame_count
+            self._last_time = now
+            return False
+
+        if frame_count != self._last_count:
+            gap = now - self._last_time
+            self.frames += frame_count - self._last_count
+            self._gaps.append(gap)
+            self.max_gap = max(self.max_gap, gap)
+            if gap > self.frame_slo:
+                self.slo_violations += 1
+
+            if self._stalled:
+                # 停滯結束 (重建後第一幀到達)
+                self._stalled = False
+                if self._recover_start is not None:
+                    elapsed = now - self._recover_start
+                    self.recoveries += 1
+                    self.last_recovery_time = elapsed
+                    self.max_recovery_time = max(self.max_recovery_time, elapsed)
+                    self.total_recovery_time += elapsed
+                self._recover_start = None
+                self._backoff = self.stall_timeout or 0.0
+
+            self._last_count = frame_count
+            self._last_time = now
+            self.stale = False
+            return False
+
+        gap = now - self._last_time
+        self.stale = gap > self.frame_slo
+        if self.stall_timeout is None or gap < self.stall_timeout:
+            return False
+
+        if not self._stalled:
+            self._stalled = True
+            self.stalls += 1
+            self._next_attempt = now
+        if now >= self._next_attempt:
+            self._next_attempt = now + self._backoff
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+            return True
+        return False
+
+    def recovery_started(self, ok):
+        """記錄一次重建嘗試；恢復時間從第一次嘗試算到第一個新幀"""
+        self.recovery_attempts += 1
+        if not ok:
+            self.failed_recoveries += 1
+        if self._recover_start is None:
+            self._recover_start = self.clock()
+
+    def current_gap(self):
+        if self._last_time is None:
+            return 0.0
+        return self.clock() - self._last_time
+
+    def stats(self):
+        gaps = sorted(self._gaps)
+
+        def percentile(q):
+            if not gaps:
+                return None
+            return gaps[min(len(gaps) - 1, int(q * len(gaps)))]
+
+        return {
+            'frames': self.frames,
+            'stale': self.stale,
+            'stalled': self._stalled,
+            'current_gap': self.current_gap(),
+            'frame_slo': self.frame_slo,
+            'slo_violations': self.slo_violations,
+            'gap_p50': percentile(0.50),
+            'gap_p99': percentile(0.99),
+            'max_gap': self.max_gap,
+            'stalls': self.stalls,
+            'recovery_attempts': self.recovery_attempts,
+            'failed_recoveries': self.failed_recoveries,
+            'recoveries': self.recoveries,
+            'last_recovery_time': self.last_recovery_time,
+            'max_recovery_time': self.max_recovery_time,
+            'avg_recovery_time': self.total_recovery_time / self.recoveries if self.recoveries else None,
+        }
 
 class WGCDriver(CaptureController):
-    def __init__(self):
-        self.lib = None
+    def __init__(self, lib=None, clock=time.monotonic, sleep=time.sleep):
+        # lib: 可注入模擬的後端 (見 wgc_sim.py)，預設載入 libs/WGC.dll
+        # clock / sleep: 等待第一幀與 watchdog 使用，測試時可換成假時鐘 (wgc_sim.FakeClock)
+        self.lib = lib
+        self.clock = clock
+        self.sleep = sleep
         self.hwnd = 0
         self.is_initialized = False
         
@@ -19,12 +216,49 @@ class WGCDriver(CaptureController):
         self.roi_w = 0
         self.roi_h = 0
         
-        self._load_dll()
+        # 擷取內容的實際尺寸 (由 DLL 回報，視窗縮放時會變)
+        self.content_w = 0
+        self.content_h = 0
+
+        # 緩衝區在第一次擷取 / 尺寸變化後才 (重新) 分配
+        self.buffer = None
+        self.buffer_size = 0
+
+        # 尺寸變化 / 停滯事件: callback(event_dict)
+        self.resize_listeners = []
+        self.stall_listeners = []
+        self._info = CaptureInfo()
+        self._resize_count = 0
+        # 目前的裁切模式 ("CENTER" / "FULL")，視窗尺寸變化時依 _compute_roi 重新判斷
+        self._roi_mode = None
+
+        # 停滯偵測 (預設關閉，見 enable_watchdog)
+        self.watchdog = None
+        self.frame_stale = False
+        # DLL 回報的累計幀數 (每次擷取時更新)；舊版 DLL 沒有幀計數，維持 None
+        # 重新初始化時 DLL 會從 0 開始計數，加上 _frame_offset 讓它保持遞增
+        self.frame_count = None
+        self._frame_offset = 0
+
+        # 初始化後最多等待第一幀的秒數 (0 表示不等待)
+        self.first_frame_timeout = 1.0
+        self.time_to_first_frame = None
+
+        if self.lib is None:
+            self._load_dll()
+
+        # 舊版 DLL 沒有 GetCaptureInfo，無法自動處理視窗尺寸變化
+        self.supports_resize = hasattr(self.lib, 'GetCaptureInfo')
+        self.supports_restart = hasattr(self.lib, 'RestartCapture')
+        # 舊版 DLL 只有一個全域 session：多個 Driver 會互相覆蓋 (見 SnapshotScheduler)
+        self.supports_sessions = isinstance(self.lib, _SessionLib)
 
     def _load_dll(self):
-        dll_path = os.path.join(os.getcwd(), 'libs', 'WGC.dll')
-        if not os.path.exists(dll_path):
-            raise FileNotFoundError(f"找不到 WGC DLL: {dll_path}")
+        # 最後才相容舊用法：從專案根目錄執行、DLL 放在 ./libs
+        candidates = DLL_SEARCH_PATHS + [os.path.join(os.getcwd(), 'libs', 'WGC.dll')]
+        dll_path = next((path for path in candidates if os.path.exists(path)), None)
+        if dll_path is None:
+            raise FileNotFoundError(f"找不到 WGC DLL，已搜尋: {', '.join(candidates)}")
         self.lib = ctypes.CDLL(dll_path)
         
         # 定義函式原型
@@ -34,6 +268,17 @@ class WGCDriver(CaptureController):
         self.lib.GetLatestFrame.argtypes = [ctypes.POINTER(ctypes.c_uint8), ctypes.c_int]
         self.lib.GetLatestFrame.restype = ctypes.c_bool
         
+        # 新版 DLL：視窗尺寸變化時在 C++ 端直接重建 frame pool，透過 GetCaptureInfo 回報
+        if hasattr(self.lib, 'GetCaptureInfo'):
+            self.lib.InitCaptureEx.argtypes = [wintypes.HWND, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int]
+            self.lib.InitCaptureEx.restype = ctypes.c_bool
+
+            self.lib.GetCaptureInfo.argtypes = [ctypes.POINTER(CaptureInfo)]
+            self.lib.GetCaptureInfo.restype = ctypes.c_bool
+
+            self.lib.RestartCapture.argtypes = []
+            self.lib.RestartCapture.restype = ctypes.c_bool
+
         # 【關鍵修改】名稱變更為 CleanupCapture
         try:
             self.lib.CleanupCapture.argtypes = []
@@ -44,81 +289,268 @@ class WGCDriver(CaptureController):
             self.lib.ReleaseCapture.argtypes = []
             self.lib.ReleaseCapture.restype = None
 
+        if not hasattr(self.lib, 'GetCaptureInfo') or not hasattr(self.lib, 'OpenCapture'):
+            # 舊版 DLL (例如 baseline 附的 libs/WGC.dll) 只有 InitCapture / GetLatestFrame / CleanupCapture
+            print(f"Warning: {dll_path} 是舊版 DLL，視窗縮放處理、停滯恢復與多工作階段都無法使用，"
+                  f"請以 WGC.sln 重新編譯")
+
+        # 多工作階段 API：每個 Driver 一個獨立 session
+        if hasattr(self.lib, 'OpenCapture'):
+            self.lib.OpenCapture.argtypes = [wintypes.HWND, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int]
+            self.lib.OpenCapture.restype = ctypes.c_int
+
+            self.lib.GetLatestFrameFor.argtypes = [ctypes.c_int, ctypes.POINTER(ctypes.c_uint8), ctypes.c_int]
+            self.lib.GetLatestFrameFor.restype = ctypes.c_bool
+
+            self.lib.GetCaptureInfoFor.argtypes = [ctypes.c_int, ctypes.POINTER(CaptureInfo)]
+            self.lib.GetCaptureInfoFor.restype = ctypes.c_bool
+
+            self.lib.RestartCaptureFor.argtypes = [ctypes.c_int]
+            self.lib.RestartCaptureFor.restype = ctypes.c_bool
+
+            self.lib.CloseCapture.argtypes = [ctypes.c_int]
+            self.lib.CloseCapture.restype = None
+
+            self.lib = _SessionLib(self.lib)
+
+    def add_resize_listener(self, callback):
+        """
+        註冊視窗尺寸變化事件。callback 收到一個 dict：
+        old_size / new_size 為 (w, h)，roi 為新的 (x, y, w, h)
+        """
+        self.resize_listeners.append(callback)
+
+    def add_stall_listener(self, callback):
+        """
+        註冊停滯事件 (每次嘗試重建 session 時觸發)。callback 收到一個 dict：
+        gap 為距離上一個新幀的秒數，attempt 為第幾次嘗試，ok 為重建是否成功
+        """
+        self.stall_listeners.append(callback)
+
+    def enable_watchdog(self, frame_slo=0.1, stall_timeout=2.0, clock=None):
+        """
+        啟用停滯偵測。frame_slo / stall_timeout 單位為秒，詳見 StallWatchdog。
+        需要新版 DLL (GetCaptureInfo / RestartCapture)。
+        """
+        if not self.supports_resize:
+            print("Warning: DLL 不支援 GetCaptureInfo，無法啟用 watchdog")
+            return None
+        self.watchdog = StallWatchdog(frame_slo, stall_timeout, clock=clock or self.clock)
+        return self.watchdog
+
+    def get_watchdog_stats(self):
+        """回傳停滯 / SLO 統計 (未啟用 watchdog 時回傳 None)"""
+        return self.watchdog.stats() if self.watchdog else None
+
+    def _emit(self, listeners, event):
+        for callback in list(listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Listener error: {e}")
+
     def init_session(self, target_id, target_type, *args):
         if target_type == "window":
             self.hwnd = target_id # 簡化邏輯，假設傳入的是 HWND
             return True
         return False
 
+    def _get_window_size(self):
+        # 獲取視窗尺寸
+        rect = wintypes.RECT()
+        ctypes.windll.user32.GetWindowRect(self.hwnd, ctypes.byref(rect))
+        return rect.right - rect.left, rect.bottom - rect.top
+
+    def _compute_roi(self, w, h):
+        """
+        根據視窗尺寸計算 ROI，回傳 (x, y, w, h, mode)。
+        mode 為 "CENTER" 時，視窗尺寸改變後 DLL 會以相同大小重新置中；
+        "FULL" 則永遠跟著整個畫面。
+        """
+        # --- 設定裁切策略 (可根據需求修改) ---
+        # 策略：如果解析度大於 1080p，或者是為了 AimBot，我們只截中心 640x640
+        CROP_SIZE = 640
+        if w > CROP_SIZE and h > CROP_SIZE:
+            return (w - CROP_SIZE) // 2, (h - CROP_SIZE) // 2, CROP_SIZE, CROP_SIZE, "CENTER"
+        return 0, 0, w, h, "FULL"
+
+    def _start_capture(self, mode):
+        """以目前的 roi_* 呼叫 C++ 初始化，成功後以 DLL 回報的實際 ROI 為準"""
+        if self.supports_resize:
+            flags = CAPTURE_FLAG_CENTER_ROI if mode == "CENTER" else 0
+            if mode == "FULL":
+                # 交給 DLL 以實際內容尺寸為準，之後也會跟著視窗縮放
+                ok = self.lib.InitCaptureEx(self.hwnd, 0, 0, 0, 0, flags)
+            else:
+                ok = self.lib.InitCaptureEx(self.hwnd, self.roi_x, self.roi_y, self.roi_w, self.roi_h, flags)
+        else:
+            ok = self.lib.InitCapture(self.hwnd, self.roi_x, self.roi_y, self.roi_w, self.roi_h)
+
+        if not ok:
+            return False
+
+        self.is_initialized = True
+        self.buffer = None
+        self._resize_count = 0
+        self._roi_mode = mode
+        self._frame_offset = self.frame_count or 0
+        if self.supports_resize and self.lib.GetCaptureInfo(self._info):
+            self._apply_capture_info(self._info)
+        if self.watchdog:
+            self.watchdog.reset()
+        return True
+
+    def _apply_capture_info(self, info):
+        self._resize_count = info.resize_count
+        self.content_w = info.content_w
+        self.content_h = info.content_h
+        self.roi_x = info.roi_x
+        self.roi_y = info.roi_y
+        if (info.roi_w, info.roi_h) != (self.roi_w, self.roi_h):
+            self.roi_w = info.roi_w
+            self.roi_h = info.roi_h
+            self.buffer = None
+
+    def _poll_capture_info(self):
+        """每次擷取前讀取 DLL 狀態：處理視窗尺寸變化，並更新 watchdog"""
+        info = self._info
+        if not self.lib.GetCaptureInfo(info):
+            return
+        if info.resize_count != self._resize_count:
+            self._handle_resize(info)
+        if self.watchdog:
+            if self.watchdog.observe(info.frame_count):
+                self._recover_session()
+            self.frame_stale = self.watchdog.stale
+
+    def _recover_session(self):
+        """重建 capture session (沿用 D3D device)"""
+        gap = self.watchdog.current_gap()
+        ok = bool(self.supports_restart and self.lib.RestartCapture())
+        self.watchdog.recovery_started(ok)
+        print(f"[WGC] 畫面停滯 {gap:.2f}s，重建 capture session: {'成功' if ok else '失敗'}")
+        self._emit(self.stall_listeners, {
+            'gap': gap,
+            'attempt': self.watchdog.recovery_attempts,
+            'ok': ok,
+        })
+
+    def _handle_resize(self, info):
+        """
+        DLL 因視窗尺寸變化重建過 frame pool：更新 ROI 並發出事件。
+        新尺寸讓裁切模式改變時 (例如 600x400 放大到 1920x1080，FULL -> CENTER)，
+        DLL 只會沿用舊模式，所以依新的 ROI 重新初始化。
+        """
+        old_size = (self.content_w, self.content_h)
+        self._apply_capture_info(info)
+
+        x, y, w, h, mode = self._compute_roi(self.content_w, self.content_h)
+        if mode != self._roi_mode:
+            print(f"[WGC] 裁切模式變更: {self._roi_mode} -> {mode}，重新初始化")
+            self.roi_x, self.roi_y, self.roi_w, self.roi_h = x, y, w, h
+            # 不等第一幀：resize 發生在擷取迴圈中，下一次 capture 自然會拿到
+            if not self._start_capture(mode):
+                self.is_initialized = False
+        print(f"[WGC] 視窗尺寸變更: {old_size[0]}x{old_size[1]} -> {self.content_w}x{self.content_h}, "
+              f"ROI: {self.roi_w}x{self.roi_h} at ({self.roi_x},{self.roi_y})")
+
+        self._emit(self.resize_listeners, {
+            'old_size': old_size,
+            'new_size': (self.content_w, self.content_h),
+            'roi': (self.roi_x, self.roi_y, self.roi_w, self.roi_h),
+        })
+
     def _initialize_wgc(self):
         """
         初始化底層 WGC session。
         我們在這裡強制設定 ROI 為 320x320 的中心區域 (如果需要的話)。
         或者預設全螢幕。
         """
-        # 獲取視窗尺寸
-        rect = wintypes.RECT()
-        ctypes.windll.user32.GetWindowRect(self.hwnd, ctypes.byref(rect))
-        w = rect.right - rect.left
-        h = rect.bottom - rect.top
+        w, h = self._get_window_size()
         
         if w <= 0 or h <= 0: return False
         
-        # --- 設定裁切策略 (可根據需求修改) ---
-        # 策略：如果解析度大於 1080p，或者是為了 AimBot，我們只截中心 640x640
-        CROP_SIZE = 640
-        if w > CROP_SIZE and h > CROP_SIZE:
-            self.roi_w = CROP_SIZE
-            self.roi_h = CROP_SIZE
-            self.roi_x = (w - CROP_SIZE) // 2
-            self.roi_y = (h - CROP_SIZE) // 2
-        else:
-            self.roi_w = w
-            self.roi_h = h
-            self.roi_x = 0
-            self.roi_y = 0
+        self.roi_x, self.roi_y, self.roi_w, self.roi_h, mode = self._compute_roi(w, h)
             
         print(f"[WGC] 初始化 ROI: {self.roi_w}x{self.roi_h} at ({self.roi_x},{self.roi_y})")
         
         # 呼叫 C++ 初始化
-        if self.lib.InitCapture(self.hwnd, self.roi_x, self.roi_y, self.roi_w, self.roi_h):
-            self.is_initialized = True
-            # 預先分配緩衝區 (重複使用，避免 malloc)
-            self.buffer_size = self.roi_w * self.roi_h * 4
-            self.buffer = (ctypes.c_uint8 * self.buffer_size)()
-            time.sleep(0.1) # 等待 WGC 暖機
+        if self._start_capture(mode):
+            self._wait_first_frame()
             return True
         return False
 
-    def capture(self):
+    def _wait_first_frame(self):
+        """
+        取代固定的暖機 sleep：第一幀到達就返回，最多等 first_frame_timeout 秒。
+        逾時不視為失敗 (例如畫面靜止的視窗)，之後的 capture 照常回傳 None 直到有幀。
+        """
+        if self.first_frame_timeout <= 0:
+            return False
+        start = self.clock()
+        deadline = start + self.first_frame_timeout
+        while True:
+            if self.supports_resize:
+                arrived = self.lib.GetCaptureInfo(self._info) and self._info.frame_count > 0
+            else:
+                # 舊版 DLL 沒有幀計數，直接試著取一幀
+                if self.buffer is None:
+                    self.buffer_size = self.roi_w * self.roi_h * 4
+                    self.buffer = (ctypes.c_uint8 * self.buffer_size)()
+                arrived = self.lib.GetLatestFrame(self.buffer, self.buffer_size)
+            if arrived:
+                self.time_to_first_frame = self.clock() - start
+                return True
+            if self.clock() >= deadline:
+                print(f"[WGC] {self.first_frame_timeout:.2f}s 內沒有收到第一幀")
+                return False
+            self.sleep(0.001)
+
+    def capture_raw(self):
+        """
+        取得最新一幀的原始 BGRA 陣列 (roi_h, roi_w, 4)，不做色彩轉換。
+        串流等不需要 PIL 的場景直接用這個，省掉一次轉換。
+        """
         # Lazy Init
         if not self.is_initialized:
             if not self._initialize_wgc():
                 return None
 
+        if self.supports_resize:
+            self._poll_capture_info()
+            self.frame_count = self._frame_offset + self._info.frame_count
+
+        # 預先分配緩衝區 (重複使用，避免 malloc)，只有尺寸變化時才重新分配
+        if self.buffer is None:
+            self.buffer_size = self.roi_w * self.roi_h * 4
+            self.buffer = (ctypes.c_uint8 * self.buffer_size)()
+
         # 極速獲取
         if self.lib.GetLatestFrame(self.buffer, self.buffer_size):
-            try:
-                # 這裡的 copy 是必須的，因為 buffer 是共用的
-                # 但因為我們已經 crop 過了 (例如 640x640)，這個 copy 很快
-                raw = bytes(self.buffer)
-                
-                # 轉 PIL
-                # 注意：這裡回傳的是 BGRA，需要轉 RGB
-                # 使用 numpy + cv2 是最快的路徑
-                arr = np.frombuffer(raw, dtype=np.uint8).reshape(self.roi_h, self.roi_w, 4)
-                
-                # BGR -> RGB (OpenCV 很快)
-                # 這裡我們只取前3個通道 (RGB)，丟棄 Alpha
-                rgb_arr = arr[..., [2, 1, 0]] 
-                
-                return Image.fromarray(rgb_arr)
-                
-            except Exception as e:
-                print(f"Capture Error: {e}")
-                return None
+            import numpy as np
+            # 這裡的 copy 是必須的，因為 buffer 是共用的
+            # 但因為我們已經 crop 過了 (例如 640x640)，這個 copy 很快
+            arr = np.frombuffer(self.buffer, dtype=np.uint8)
+            return arr.reshape(self.roi_h, self.roi_w, 4).copy()
         return None
 
+    def capture(self):
+        arr = self.capture_raw()
+        if arr is None:
+            return None
+        try:
+            from PIL import Image
+            # 轉 PIL
+            # 注意：這裡回傳的是 BGRA，需要轉 RGB
+            # 這裡我們只取前3個通道 (RGB)，丟棄 Alpha
+            rgb_arr = arr[..., [2, 1, 0]]
+            
+            return Image.fromarray(rgb_arr)
+            
+        except Exception as e:
+            print(f"Capture Error: {e}")
+            return None
+
     def release(self):
         if self.is_initialized:
             # 【關鍵修改】呼叫新名稱
@@ -0,0 +1,387 @@
+import argparse
+import heapq
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SnapshotTarget:
+    """排程中的單一目標視窗，以及它的統計數字"""
+    def __init__(self, name, hwnd, interval, priority=0):
+        self.name = name
+        self.hwnd = hwnd
+        self.interval = interval
+        self.priority = priority
+
+        self.driver = None       # 保持暖機的 capture session；截圖進行中由 worker 持有 (此時為 None)
+        self.in_flight = False
+        self.next_due = None
+        self.generation = 0      # 每次加入時重新編號，讓移除 / 取代前的 queue 項目失效
+
+        self.shots = 0
+        self.failures = 0
+        self.missed = 0          # 完成時間超過 due + tolerance
+        self.coalesced = 0       # 因為上一張還沒完成 / 落後太多而合併掉的時段
+        self.last_latency = None
+        self.max_lateness = 0.0
+
+    def stats(self):
+        return {
+            'hwnd': self.hwnd,
+            'interval': self.interval,
+            'priority': self.priority,
+            'next_due': self.next_due,
+            'in_flight': self.in_flight,
+            'warm': self.driver is not None or self.in_flight,
+            'shots': self.shots,
+            'failures': self.failures,
+            'missed': self.missed,
+            'coalesced': self.coalesced,
+            'last_latency': self.last_latency,
+            'max_lateness': self.max_lateness,
+        }
+
+
+def default_driver_factory(target):
+    """為目標建立 WGCDriver (多工作階段 DLL 下每個目標各自保持一個 session)"""
+    from wgc_driver import WGCDriver
+    driver = WGCDriver()
+    driver.init_session(target.hwnd, "window")
+    return driver
+
+
+class SnapshotScheduler:
+    """
+    以 deadline queue 排程多個視窗的定期截圖。
+
+    - 每個目標有自己的 interval，以固定頻率 (fixed-rate) 排程，不會因為截圖耗時而漂移
+    - 同時只會有 max_workers 張截圖在進行；worker 全忙時，已到期的工作先比 priority
+      (越大越先)，同 priority 再比 deadline (越早越先)
+    - 目標上一張還沒完成時，這個時段直接合併 (coalesce)，不會重複排隊；
+      落後超過一個 interval 時，錯過的時段也一併合併
+    - 每個目標的 capture session 會保持暖機，下一次截圖直接重用
+      (需要多工作階段 DLL；舊版 DLL 的 Driver (supports_sessions 為 False) 只有一個全域
+      session，這類截圖會一次一張執行，且每張都重新初始化)
+    - 完成時間超過 due + tolerance 時記為 missed，並呼叫 on_missed
+
+    clock 可注入假時鐘；此時不要呼叫 start()，改為推進時鐘後手動呼叫 run_pending()。
+    on_snapshot(name, frame) 在 worker 執行緒中呼叫，frame 為 BGRA numpy 陣列，
+    編碼 / 存檔等工作可以直接在這裡做 (各 worker 平行處理)。
+    """
+    def __init__(self, driver_factory=default_driver_factory, max_workers=4, tolerance=0.5,
+                 on_snapshot=None, on_missed=None, clock=time.monotonic):
+        self.driver_factory = driver_factory
+        self.max_workers = max_workers
+        self.tolerance = tolerance
+        self.on_snapshot = on_snapshot
+        self.on_missed = on_missed
+        self.clock = clock
+
+        self._targets = {}
+        self._queue = []         # 尚未到期: (due, -priority, seq, name, generation)
+        self._ready = []         # 已到期、等待 worker: (-priority, due, seq, name, generation)
+        self._seq = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._legacy_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wgc-snapshot")
+        self._thread = None
+        self._stop = threading.Event()
+
+    # ---- 目標管理 ----
+    def add_target(self, name, hwnd, interval, priority=0, first_due=None):
+        """
+        加入 (或取代) 一個目標。interval 單位為秒；priority 越大越優先。
+        first_due 預設為現在 (立即截第一張)。
+        取代同一個視窗時沿用暖機中的 session；舊目標還在截圖時，
+        等那張完成後才交接 (見 _finish_driver)。
+        """
+        if interval <= 0:
+            raise ValueError(f"interval 必須大於 0: {interval}")
+        with self._cond:
+            old = self._targets.get(name)
+            target = SnapshotTarget(name, hwnd, interval, priority)
+            self._seq += 1
+            target.generation = self._seq
+            if old is not None:
+                old.generation = -1
+                if old.hwnd == hwnd:
+                    target.driver, old.driver = old.driver, None
+            self._targets[name] = target
+            self._push(target, self.clock() if first_due is None else first_due)
+            self._cond.notify_all()
+        if old is not None:
+            self._release_driver(old)
+        return target
+
+    def remove_target(self, name):
+        """移除目標。截圖進行中時，session 由 worker 在完成後釋放"""
+        with self._cond:
+            target = self._targets.pop(name, None)
+            if target is None:
+                return False
+            target.generation = -1
+        self._release_driver(target)
+        return True
+
+    def stats(self):
+        with self._lock:
+            targets = {name: t.stats() for name, t in self._targets.items()}
+            running = self._running
+            queued = len(self._queue) + len(self._ready)
+        return {
+            'running': running,
+            'queued': queued,
+            'shots': sum(t['shots'] for t in targets.values()),
+            'failures': sum(t['failures'] for t in targets.values()),
+            'missed': sum(t['missed'] for t in targets.values()),
+            'coalesced': sum(t['coalesced'] for t in targets.values()),
+            'targets': targets,
+        }
+
+    # ---- 排程 ----
+    def _push(self, target, due):
+        target.next_due = due
+        self._seq += 1
+        heapq.heappush(self._queue, (due, -target.priority, self._seq, target.name, target.generation))
+
+    def _current(self, name, generation):
+        target = self._targets.get(name)
+        if target is None or target.generation != generation:
+            return None
+        return target
+
+    def _reschedule(self, target, due, now):
+        # fixed-rate：下一個時段從 due 起算；落後超過一個 interval 的時段直接合併
+        next_due = due + target.interval
+        if next_due <= now:
+            skipped = int((now - next_due) // target.interval) + 1
+            next_due += skipped * target.interval
+            target.coalesced += skipped
+        self._push(target, next_due)
+
+    def run_pending(self):
+        """
+        派發所有已到期的工作 (受 max_workers 限制)。
+        回傳下一次需要醒來的時間 (clock 時間)，沒有任何目標時回傳 None。
+        """
+        now = self.clock()
+        dispatch = []
+        with self._cond:
+            # 到期的工作移到 ready heap；目標上一張還在進行時直接合併這個時段
+            while self._queue and self._queue[0][0] <= now:
+                due, neg_priority, seq, name, generation = heapq.heappop(self._queue)
+                target = self._current(name, generation)
+                if target is None:
+                    continue
+                if target.in_flight:
+                    target.coalesced += 1
+                    self._reschedule(target, due, now)
+                    continue
+                heapq.heappush(self._ready, (neg_priority, due, seq, name, generation))
+
+            # worker 有空時依 (priority, deadline) 派發
+            while self._ready and self._running < self.max_workers:
+                _, due, _, name, generation = heapq.heappop(self._ready)
+                target = self._current(name, generation)
+                if target is None:
+                    continue
+                self._reschedule(target, due, now)
+                # 截圖期間 driver 由 worker 獨佔
+                driver, target.driver = target.driver, None
+                target.in_flight = True
+                self._running += 1
+                dispatch.append((target, due, driver))
+
+            wake = self._queue[0][0] if self._queue else None
+
+        for target, due, driver in dispatch:
+            self._executor.submit(self._run_shot, target, due, driver)
+        return wake
+
+    def _run_shot(self, target, due, driver):
+        frame = None
+        started = self.clock()
+        try:
+            if driver is None:
+                driver = self.driver_factory(target)
+            if getattr(driver, 'supports_sessions', True):
+                frame = driver.capture_raw()
+            else:
+                frame = self._capture_legacy(driver)
+        except Exception as e:
+            print(f"[Scheduler] {target.name} 截圖失敗: {e}")
+            # session 可能已失效 (視窗關閉等)，下一次重新建立
+            self._release(target.name, driver)
+            driver = None
+        finished = self.clock()
+
+        lateness = finished - due
+        missed = lateness > self.tolerance
+        try:
+            if frame is not None and self.on_snapshot:
+                self.on_snapshot(target.name, frame)
+            if missed and self.on_missed:
+                self.on_missed(target.name, lateness)
+        except Exception as e:
+            print(f"[Scheduler] {target.name} callback 錯誤: {e}")
+        finally:
+            with self._cond:
+                target.in_flight = False
+                self._running -= 1
+                driver = self._finish_driver(target, driver)
+                if frame is None:
+                    target.failures += 1
+                else:
+                    target.shots += 1
+                if missed:
+                    target.missed += 1
+                target.last_latency = finished - started
+                target.max_lateness = max(target.max_lateness, lateness)
+                self._cond.notify_all()
+            # 目標已被移除 / 取代且沒有人接手的 session
+            self._release(target.name, driver)
+
+    def _capture_legacy(self, driver):
+        """
+        舊版 DLL：所有 Driver 共用 DLL 內唯一的 session，InitCapture / Cleanup 會互相覆蓋。
+        一次只截一張，每張都重新初始化、截完就 Cleanup，不保留暖機狀態。
+        """
+        with self._legacy_lock:
+            try:
+                return driver.capture_raw()
+            finally:
+                driver.release()
+
+    def _finish_driver(self, target, driver):
+        """
+        截圖完成時 (持有 _cond) 決定 session 的去處，回傳需要釋放的 driver：
+        目標仍有效時放回去；目標已被取代時交給同名、同視窗且目前沒有 session 的新目標。
+        """
+        if driver is None:
+            return None
+        if self._current(target.name, target.generation) is target:
+            target.driver = driver
+            return None
+        successor = self._targets.get(target.name)
+        if (successor is not None and successor.hwnd == target.hwnd
+                and successor.driver is None and not successor.in_flight):
+            successor.driver = driver
+            return None
+        return driver
+
+    def wait_idle(self, timeout=None):
+        """等到目前沒有進行中的截圖 (測試時搭配假時鐘使用)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._running == 0, timeout)
+
+    # ---- 背景執行 ----
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            wake = self.run_pending()
+            with self._cond:
+                if self._stop.is_set():
+                    break
+                if self._ready and self._running < self.max_workers:
+                    continue
+                # worker 空出來或有新目標時會被 notify；最多睡 1 秒
+                timeout = 1.0 if wake is None else min(1.0, max(0.0, wake - self.clock()))
+                if timeout > 0:
+                    self._cond.wait(timeout)
+
+    def stop(self, release=True):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=True)
+        if release:
+            with self._lock:
+                targets = list(self._targets.values())
+            for target in targets:
+                self._release_driver(target)
+
+    def _release_driver(self, target):
+        with self._lock:
+            driver, target.driver = target.driver, None
+        self._release(target.name, driver)
+
+    def _release(self, name, driver):
+        if driver is not None:
+            try:
+                driver.release()
+            except Exception as e:
+                print(f"[Scheduler] 釋放 {name} 失敗: {e}")
+
+
+def save_png(output_dir):
+    """建立一個 on_snapshot callback：把每張截圖存成 {name}_{timestamp}.png"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    def on_snapshot(name, frame):
+        import cv2
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        cv2.imwrite(os.path.join(output_dir, f"{name}_{timestamp}.png"), frame)
+    return on_snapshot
+
+
+def _parse_target(text):
+    # HWND:INTERVAL[:PRIORITY]，HWND 可用 0x 十六進位
+    parts = text.split(":")
+    hwnd = int(parts[0], 0)
+    interval = float(parts[1]) if len(parts) > 1 else 1.0
+    priority = int(parts[2]) if len(parts) > 2 else 0
+    return hwnd, interval, priority
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="多視窗定期截圖排程")
+    parser.add_argument("--target", action="append", type=_parse_target, default=[],
+                        help="HWND:INTERVAL[:PRIORITY]，可重複指定")
+    parser.add_argument("--simulate", type=int, default=0, help="改用 N 個模擬視窗 (間隔 1~60 秒)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--output-dir", help="存檔目錄 (不指定則不存檔)")
+    args = parser.parse_args()
+
+    factory = default_driver_factory
+    if args.simulate:
+        from wgc_sim import SimulatedWGCDriver
+
+        def factory(target):
+            return SimulatedWGCDriver(640, 480)
+
+    scheduler = SnapshotScheduler(
+        factory, max_workers=args.workers, tolerance=args.tolerance,
+        on_snapshot=save_png(args.output_dir) if args.output_dir else None,
+        on_missed=lambda name, late: print(f"[Scheduler] {name} 錯過 deadline ({late:.3f}s)"))
+
+    for i in range(args.simulate):
+        scheduler.add_target(f"sim{i}", i + 1, interval=(1.0, 5.0, 60.0)[i % 3])
+    for hwnd, interval, priority in args.target:
+        scheduler.add_target(f"{hwnd:#x}", hwnd, interval, priority)
+
+    scheduler.start()
+    try:
+        time.sleep(args.duration)
+    except KeyboardInterrupt:
+        pass
+    scheduler.stop()
+
+    stats = scheduler.stats()
+    print(f"\n=== Snapshot Scheduler ({args.duration:.0f}s, {args.workers} workers) ===")
+    print(f"shots={stats['shots']} failures={stats['failures']} missed={stats['missed']} coalesced={stats['coalesced']}")
+    for name, t in stats['targets'].items():
+        latency = f"{t['last_latency'] * 1000:.1f}ms" if t['last_latency'] is not None else "-"
+        print(f"- {name}: every {t['interval']}s, shots={t['shots']} missed={t['missed']} "
+              f"coalesced={t['coalesced']} last_latency={latency}")
@@ -0,0 +1,683 @@
+import argparse
+import json
+import os
+import socket
+import stat
+import struct
+import threading
+import time
+from collections import deque
+import numpy as np
+import cv2
+
+# ==========================================
+# 協定
+# ==========================================
+# 伺服器 -> 客戶端：固定長度 header + payload
+#   header: type, seq, width, height, tile, payload_len
+#   KEYFRAME payload: 完整 BGR 畫面 (height * width * 3)
+#   DELTA    payload: uint32 N + N 個 tile 索引 (uint32) + N 個 tile 像素 (tile * tile * 3)
+# 客戶端 -> 伺服器：一行一個 JSON，例如
+#   {"roi": [x, y, w, h], "scale": 0.5}   設定 ROI / 縮放 (roi 為 null 表示整個畫面)
+#   {"keyframe": true}                    要求下一幀送完整畫面
+#   {"ack": seq}                          已收到 seq (含之前) 的幀
+# 每個訂閱者最多只有 max_inflight 幀尚未 ack；額滿時伺服器不再送出，
+# 只保留最新一幀等待，其餘丟棄 (客戶端必須 ack，FrameClient 會自動處理)
+MSG_KEYFRAME = 1
+MSG_DELTA = 2
+
+_HEADER = struct.Struct("<BIHHHI")
+_COUNT = struct.Struct("<I")
+
+
+def parse_address(tcp=None, unix=None):
+    """將 CLI 參數轉成 socket 位址：TCP 為 (host, port)，Unix socket 為路徑字串"""
+    if unix:
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("此平台不支援 Unix socket，請改用 --tcp")
+        return unix
+    host, _, port = (tcp or "127.0.0.1:5555").rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def _socket_family(address):
+    return socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+
+
+def _remove_socket_file(path):
+    """刪除殘留的 Unix socket 檔；路徑上是其他檔案時拒絕 (避免誤刪打錯路徑的檔案)"""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} 已存在且不是 Unix socket，不會刪除")
+    os.unlink(path)
+
+
+def apply_view(frame, roi=None, scale=1.0):
+    """
+    從 BGRA 幀取出客戶端要求的 ROI 並縮放，回傳連續的 BGR 陣列。
+    ROI 超出畫面時會自動裁到畫面範圍內。
+    """
+    h, w = frame.shape[:2]
+    if roi:
+        x, y, rw, rh = roi
+        x = min(max(0, int(x)), w - 1)
+        y = min(max(0, int(y)), h - 1)
+        rw = max(1, min(int(rw), w - x))
+        rh = max(1, min(int(rh), h - y))
+        frame = frame[y:y + rh, x:x + rw]
+
+    bgr = np.ascontiguousarray(frame[..., :3])
+    if scale != 1.0:
+        tw = max(1, int(round(bgr.shape[1] * scale)))
+        th = max(1, int(round(bgr.shape[0] * scale)))
+        bgr = cv2.resize(bgr, (tw, th), interpolation=cv2.INTER_AREA)
+    return bgr
+
+
+# ==========================================
+# Tile 差分編碼
+# ==========================================
+class TileDeltaEncoder:
+    """
+    以 tile 為單位比對上一次「實際送出」的畫面，只送有變化的 tile。
+    畫面會補零到 tile 的整數倍，讓每個 tile 大小一致。
+    """
+    def __init__(self, tile=32, keyframe_interval=120):
+        self.tile = tile
+        self.keyframe_interval = keyframe_interval
+        self._prev = None
+        self._since_key = 0
+
+    def reset(self):
+        """下一次 encode 強制輸出 keyframe"""
+        self._prev = None
+
+    def _pad(self, view):
+        t = self.tile
+        h, w = view.shape[:2]
+        ph, pw = -h % t, -w % t
+        if ph or pw:
+            view = np.pad(view, ((0, ph), (0, pw), (0, 0)))
+        return view
+
+    def encode(self, view):
+        """回傳 (msg_type, payload)"""
+        padded = self._pad(view)
+        if (self._prev is None or self._prev.shape != padded.shape
+                or self._since_key >= self.keyframe_interval):
+            return self._keyframe(view, padded)
+
+        t = self.tile
+        th, tw = padded.shape[0] // t, padded.shape[1] // t
+        changed = (padded != self._prev).reshape(th, t, tw, t * 3).any(axis=(1, 3))
+        rows, cols = np.nonzero(changed)
+
+        # 變動超過一半時，送 keyframe 反而比較省
+        if len(rows) * 2 > th * tw:
+            return self._keyframe(view, padded)
+
+        tiles = padded.reshape(th, t, tw, t, 3)[rows, :, cols]
+        index = (rows * tw + cols).astype("<u4")
+        payload = b"".join((_COUNT.pack(len(index)), index.tobytes(), tiles.tobytes()))
+
+        self._prev = padded
+        self._since_key += 1
+        return MSG_DELTA, payload
+
+    def _keyframe(self, view, padded):
+        self._prev = padded
+        self._since_key = 0
+        return MSG_KEYFRAME, view.tobytes()
+
+
+class TileDeltaDecoder:
+    """TileDeltaEncoder 的反向操作，維護客戶端目前的畫面"""
+    def __init__(self):
+        self._frame = None
+
+    def decode(self, msg_type, width, height, tile, payload):
+        """
+        回傳目前畫面 (height, width, 3) BGR。
+        回傳的陣列會在下一次 decode 時被覆寫，需要保留請自行 copy。
+        """
+        ph, pw = height + (-height % tile), width + (-width % tile)
+
+        if msg_type == MSG_KEYFRAME:
+            if self._frame is None or self._frame.shape != (ph, pw, 3):
+                self._frame = np.zeros((ph, pw, 3), dtype=np.uint8)
+            view = np.frombuffer(payload, dtype=np.uint8).reshape(height, width, 3)
+            self._frame[:height, :width] = view
+        elif msg_type == MSG_DELTA:
+            if self._frame is None or self._frame.shape != (ph, pw, 3):
+                raise ValueError("收到 delta 但沒有對應的 keyframe")
+            count, = _COUNT.unpack_from(payload)
+            index = np.frombuffer(payload, dtype="<u4", count=count, offset=_COUNT.size)
+            tiles = np.frombuffer(payload, dtype=np.uint8, offset=_COUNT.size + 4 * count)
+            th, tw = ph // tile, pw // tile
+            rows, cols = np.divmod(index, tw)
+            self._frame.reshape(th, tile, tw, tile, 3)[rows, :, cols] = tiles.reshape(count, tile, tile, 3)
+        else:
+            raise ValueError(f"未知的訊息類型: {msg_type}")
+
+        return self._frame[:height, :width]
+
+
+# ==========================================
+# 伺服器
+# ==========================================
+class _Published:
+    """一張已擷取的幀，快取各種 ROI / 縮放的結果，讓相同設定的訂閱者共用"""
+    def __init__(self, seq, frame):
+        self.seq = seq
+        self.frame = frame
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def view(self, roi, scale):
+        key = (roi, scale)
+        with self._lock:
+            view = self._views.get(key)
+            if view is None:
+                view = apply_view(self.frame, roi, scale)
+                self._views[key] = view
+        return view
+
+
+class _Subscriber:
+    """
+    單一客戶端。只保留「最新一幀」等待送出：
+    客戶端太慢時舊的幀直接被覆蓋 (計入 dropped)，不會拖慢其他人。
+    差分永遠相對於這個客戶端實際收到的畫面，所以丟幀不會造成畫面錯誤。
+
+    sendall 只要 kernel buffer 收下就返回，無法反映客戶端真正的進度，
+    所以改用 ack 做背壓：未 ack 的幀達到 max_inflight 時暫停送出。
+    """
+    def __init__(self, server, sock, peer):
+        self.server = server
+        self.sock = sock
+        self.peer = peer
+        self.encoder = TileDeltaEncoder(server.tile, server.keyframe_interval)
+
+        self.roi = None
+        self.scale = 1.0
+        self.closed = False
+        self._force_keyframe = False
+        self._pending = None
+        self._inflight = deque()     # 已送出、尚未 ack 的 seq
+        self._cond = threading.Condition()
+
+        self.frames_sent = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+        self.last_ack = None
+
+    def start(self):
+        threading.Thread(target=self._send_loop, daemon=True).start()
+        threading.Thread(target=self._recv_loop, daemon=True).start()
+
+    def offer(self, published):
+        with self._cond:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = published
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._cond.notify()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self.server._remove(self)
+
+    def stats(self):
+        return {
+            'peer': self.peer,
+            'roi': self.roi,
+            'scale': self.scale,
+            'frames_sent': self.frames_sent,
+            'keyframes': self.keyframes,
+            'deltas': self.deltas,
+            'dropped': self.dropped,
+            'bytes_sent': self.bytes_sent,
+            'inflight': len(self._inflight),
+            'last_ack': self.last_ack,
+        }
+
+    def _send_loop(self):
+        tile = self.encoder.tile
+        while True:
+            with self._cond:
+                while not self.closed and (self._pending is None
+                                           or len(self._inflight) >= self.server.max_inflight):
+                    self._cond.wait()
+                if self.closed:
+                    return
+                published, self._pending = self._pending, None
+                seq = published.seq & 0xFFFFFFFF
+                self._inflight.append(seq)
+                roi, scale = self.roi, self.scale
+                force_keyframe, self._force_keyframe = self._force_keyframe, False
+
+            # encoder 只在送出執行緒操作，避免與 _recv_loop 競爭
+            if force_keyframe:
+                self.encoder.reset()
+            view = published.view(roi, scale)
+            msg_type, payload = self.encoder.encode(view)
+            header = _HEADER.pack(msg_type, seq, view.shape[1], view.shape[0], tile, len(payload))
+            try:
+                self.sock.sendall(header)
+                self.sock.sendall(payload)
+            except OSError:
+                self.close()
+                return
+
+            self.frames_sent += 1
+            self.bytes_sent += len(header) + len(payload)
+            if msg_type == MSG_KEYFRAME:
+                self.keyframes += 1
+            else:
+                self.deltas += 1
+
+    def _recv_loop(self):
+        try:
+            for line in self.sock.makefile('rb'):
+                try:
+                    self._handle_request(json.loads(line))
+                except (ValueError, TypeError) as e:
+                    print(f"[WGC Server] 忽略無效請求 {self.peer}: {e}")
+        except OSError:
+            pass
+        self.close()
+
+    def _handle_request(self, request):
+        if not isinstance(request, dict):
+            raise ValueError(f"請求必須是 JSON 物件: {request!r}")
+        with self._cond:
+            if 'roi' in request or 'scale' in request:
+                roi = request.get('roi', self.roi)
+                scale = float(request.get('scale', self.scale))
+                if roi is not None:
+                    roi = tuple(int(v) for v in roi)
+                    if len(roi) != 4 or roi[2] <= 0 or roi[3] <= 0:
+                        raise ValueError(f"roi 格式錯誤: {roi}")
+                if not 0.0 < scale <= 1.0:
+                    raise ValueError(f"scale 必須介於 (0, 1]: {scale}")
+                self.roi, self.scale = roi, scale
+                self._force_keyframe = True
+            if request.get('keyframe'):
+                self._force_keyframe = True
+            if 'ack' in request:
+                self._ack(int(request['ack']))
+
+    def _ack(self, seq):
+        # ack 是累積的：seq 之前送出的幀也一併視為已收到
+        if seq not in self._inflight:
+            return
+        while self._inflight.popleft() != seq:
+            pass
+        self.last_ack = seq
+        self._cond.notify()
+
+
+class FrameServer:
+    """
+    包裝一個擷取來源 (WGCDriver 或任何有 capture_raw() 的物件)，
+    以 TCP 或 Unix socket 將畫面串流給多個訂閱者。
+    """
+    def __init__(self, source, address, max_fps=60.0, tile=32, keyframe_interval=120, max_inflight=2):
+        self.source = source
+        self.address = address
+        self.max_fps = max_fps
+        self.tile = tile
+        self.keyframe_interval = keyframe_interval
+        self.max_inflight = max_inflight
+
+        self.frames_captured = 0
+        self.frames_unchanged = 0    # 來源沒有新幀 (靜止視窗)，略過不發布
+        self.capture_errors = 0
+        self._seq = 0
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener = None
+        self._threads = []
+
+    def start(self):
+        family = _socket_family(self.address)
+        if family != socket.AF_INET:
+            _remove_socket_file(self.address)
+
+        self._listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(self.address)
+        self._listener.listen()
+        # port 0 時取得實際綁定的位址
+        self.address = self._listener.getsockname()
+
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._accept_loop, daemon=True),
+            threading.Thread(target=self._capture_loop, daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        print(f"[WGC Server] 監聽於 {self.address}")
+
+    def stop(self):
+        self._stop.set()
+        if self._listener:
+            # Linux 上只 close() 不會喚醒卡在 accept() 的執行緒，要先 shutdown
+            try:
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+        for t in self._threads:
+            t.join(timeout=2.0)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.close()
+        if isinstance(self.address, str):
+            try:
+                _remove_socket_file(self.address)
+            except FileExistsError as e:
+                print(f"[WGC Server] {e}")
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stats(self):
+        with self._lock:
+            return [sub.stats() for sub in self._subscribers]
+
+    def _remove(self, subscriber):
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                sock, peer = self._listener.accept()
+            except OSError:
+                return
+            if sock.family == socket.AF_INET:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sub = _Subscriber(self, sock, peer or "unix")
+            with self._lock:
+                self._subscribers.append(sub)
+            sub.start()
+            print(f"[WGC Server] 新訂閱者: {sub.peer}")
+
+    def _capture_loop(self):
+        interval = 1.0 / self.max_fps if self.max_fps else 0.0
+        next_t = time.monotonic()
+        last_count = None
+        last_error_log = 0.0
+        while not self._stop.is_set():
+            try:
+                frame = self.source.capture_raw()
+            except Exception as e:
+                # 擷取失敗不讓執行緒結束 (否則客戶端永遠收不到幀)，最多每秒記錄一次
+                frame = None
+                self.capture_errors += 1
+                if time.monotonic() - last_error_log >= 1.0:
+                    last_error_log = time.monotonic()
+                    print(f"[WGC Server] 擷取錯誤 (累計 {self.capture_errors} 次): {e}")
+
+            # capture_raw 在沒有新幀時仍回傳最後一幀；有幀計數時 (新版 DLL) 略過重複的幀
+            count = getattr(self.source, 'frame_count', None)
+            if frame is not None and count is not None and count == last_count:
+                self.frames_unchanged += 1
+                frame = None
+            if frame is not None:
+                last_count = count
+                self._seq += 1
+                self.frames_captured += 1
+                published = _Published(self._seq, frame)
+                with self._lock:
+                    subscribers = list(self._subscribers)
+                for sub in subscribers:
+                    sub.offer(published)
+
+            next_t += interval
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_t = time.monotonic()
+
+
+# ==========================================
+# 客戶端
+# ==========================================
+class FrameClient:
+    """連線到 FrameServer 並還原畫面"""
+    def __init__(self, address, roi=None, scale=1.0, timeout=5.0):
+        self.sock = socket.socket(_socket_family(address), socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(address)
+        if self.sock.family == socket.AF_INET:
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._rfile = self.sock.makefile('rb')
+        self.decoder = TileDeltaDecoder()
+
+        self.frames = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self.bytes_received = 0
+
+        if roi is not None or scale != 1.0:
+            self.set_view(roi, scale)
+
+    def _send(self, request):
+        self.sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+
+    def set_view(self, roi=None, scale=1.0):
+        """設定 ROI (x, y, w, h) 與縮放比例，伺服器會重新送 keyframe"""
+        self._send({'roi': list(roi) if roi is not None else None, 'scale': scale})
+
+    def request_keyframe(self):
+        self._send({'keyframe': True})
+
+    def recv_frame(self):
+        """回傳 (seq, BGR 陣列)；連線關閉時回傳 None。收到後自動 ack，伺服器才會送下一幀"""
+        header = self._rfile.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        msg_type, seq, width, height, tile, length = _HEADER.unpack(header)
+        payload = self._rfile.read(length)
+        if len(payload) < length:
+            return None
+
+        self.frames += 1
+        self.bytes_received += _HEADER.size + length
+        if msg_type == MSG_KEYFRAME:
+            self.keyframes += 1
+        else:
+            self.deltas += 1
+        frame = self.decoder.decode(msg_type, width, height, tile, payload)
+        self._send({'ack': seq})
+        return seq, frame
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+# ==========================================
+# CLI: wgc serve / wgc bench
+# ==========================================
+def _parse_size(text):
+    w, _, h = text.lower().partition("x")
+    return int(w), int(h)
+
+
+def _make_source(args):
+    if args.simulate:
+        from wgc_sim import SimulatedWGCDriver
+        w, h = args.size
+        driver = SimulatedWGCDriver(w, h, fps=args.fps)
+    else:
+        from wgc_driver import WGCDriver
+        driver = WGCDriver()
+        if not driver.init_session(args.hwnd, "window"):
+            raise SystemExit(f"無法綁定視窗 HWND={args.hwnd:#x}")
+
+    if args.stall_timeout:
+        driver.enable_watchdog(frame_slo=args.frame_slo, stall_timeout=args.stall_timeout)
+    return driver
+
+
+def run_serve(args):
+    source = _make_source(args)
+    server = FrameServer(source, parse_address(args.tcp, args.unix), max_fps=args.fps,
+                         tile=args.tile, keyframe_interval=args.keyframe_interval,
+                         max_inflight=args.max_inflight)
+    try:
+        server.serve_forever()
+    finally:
+        source.release()
+
+
+def run_bench(args):
+    """模擬來源 + loopback 客戶端，量測吞吐量、頻寬與丟幀"""
+    from wgc_sim import SimulatedWGCDriver
+
+    w, h = args.size
+    source = SimulatedWGCDriver(w, h, fps=args.fps)
+    address = parse_address(args.tcp or "127.0.0.1:0", args.unix)
+    server = FrameServer(source, address, max_fps=args.fps,
+                         tile=args.tile, keyframe_interval=args.keyframe_interval,
+                         max_inflight=args.max_inflight)
+    server.start()
+
+    stop = threading.Event()
+    clients = []
+    for i in range(args.clients + args.slow_clients):
+        slow = i >= args.clients
+        clients.append((FrameClient(server.address, scale=args.scale), slow))
+    # 每個客戶端收到幀時落後伺服器最新幀多少 (seq 差)，前 1 秒視為暖機不計
+    max_lag = {id(client): 0 for client, _ in clients}
+    warmup_until = time.perf_counter() + min(1.0, args.duration / 2)
+
+    def consume(client, slow):
+        while not stop.is_set():
+            try:
+                result = client.recv_frame()
+            except OSError:
+                return
+            if result is None:
+                return
+            if time.perf_counter() >= warmup_until:
+                lag = server.frames_captured - result[0]
+                max_lag[id(client)] = max(max_lag[id(client)], lag)
+            if slow:
+                time.sleep(args.slow_delay)
+
+    threads = [threading.Thread(target=consume, args=c, daemon=True) for c in clients]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    elapsed = time.perf_counter() - start
+    server_stats = server.stats()
+
+    stop.set()
+    for client, _ in clients:
+        client.close()
+    for t in threads:
+        t.join(timeout=2.0)
+    server.stop()
+    source.release()
+
+    raw_frame = int(round(source.roi_w * args.scale)) * int(round(source.roi_h * args.scale)) * 3
+    print(f"\n=== WGC Stream Benchmark ({w}x{h}, scale={args.scale}, tile={args.tile}, {elapsed:.1f}s) ===")
+    print(f"Server captured: {server.frames_captured} frames ({server.frames_captured / elapsed:.1f} fps), "
+          f"unchanged={server.frames_unchanged} errors={server.capture_errors}")
+    for i, (client, slow) in enumerate(clients):
+        kind = "slow" if slow else "fast"
+        per_frame = client.bytes_received / client.frames if client.frames else 0
+        ratio = raw_frame / per_frame if per_frame else 0
+        print(f"- client {i} ({kind}): {client.frames} frames ({client.frames / elapsed:.1f} fps), "
+              f"key={client.keyframes} delta={client.deltas}, "
+              f"{client.bytes_received / 1e6:.2f} MB, {per_frame / 1024:.1f} KB/frame (x{ratio:.1f} vs raw)")
+    for s in server_stats:
+        print(f"- subscriber {s['peer']}: sent={s['frames_sent']} dropped={s['dropped']}")
+
+    # 背壓檢查：慢速客戶端最多落後 max_inflight 幀的處理時間 (加上一幀的誤差)
+    bound = (args.max_inflight + 1) * max(1, round(args.slow_delay * args.fps)) + 2
+    ok = True
+    for i, (client, slow) in enumerate(clients):
+        if slow:
+            lag = max_lag[id(client)]
+            print(f"- client {i} (slow): max lag {lag} frames (bound {bound})")
+            ok = ok and lag <= bound
+    if not ok:
+        raise SystemExit("慢速客戶端的延遲沒有收斂，背壓失效")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="wgc", description="WGC 截圖串流工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(p, default_tcp):
+        addr = p.add_mutually_exclusive_group()
+        addr.add_argument("--tcp", default=default_tcp, help="HOST:PORT")
+        addr.add_argument("--unix", help="Unix socket 路徑")
+        p.add_argument("--fps", type=float, default=60.0, help="最高擷取 FPS")
+        p.add_argument("--tile", type=int, default=32, help="差分 tile 大小 (px)")
+        p.add_argument("--keyframe-interval", type=int, default=120, help="每幾幀強制送一次 keyframe")
+        p.add_argument("--size", type=_parse_size, default=(1280, 720), help="模擬來源尺寸，例如 1280x720")
+        p.add_argument("--max-inflight", type=int, default=2, help="每個訂閱者最多幾幀尚未 ack")
+
+    serve = sub.add_parser("serve", help="無頭模式：擷取視窗並串流給訂閱者")
+    target = serve.add_mutually_exclusive_group(required=True)
+    target.add_argument("--hwnd", type=lambda s: int(s, 0), help="目標視窗 HWND (可用 0x 十六進位)")
+    target.add_argument("--simulate", action="store_true", help="使用模擬來源")
+    add_common(serve, "127.0.0.1:5555")
+    serve.add_argument("--stall-timeout", type=float, default=None,
+                       help="畫面停滯超過幾秒就重建 capture session (預設關閉)")
+    serve.add_argument("--frame-slo", type=float, default=0.1, help="幀間隔 SLO (秒)")
+    serve.set_defaults(func=run_serve)
+
+    bench = sub.add_parser("bench", help="以模擬來源與 loopback 客戶端量測串流效能")
+    add_common(bench, None)
+    bench.add_argument("--duration", type=float, default=5.0)
+    bench.add_argument("--clients", type=int, default=2, help="正常速度的客戶端數量")
+    bench.add_argument("--slow-clients", type=int, default=1, help="慢速客戶端數量 (用來觀察丟幀)")
+    bench.add_argument("--slow-delay", type=float, default=0.1, help="慢速客戶端每幀延遲 (秒)")
+    bench.add_argument("--scale", type=float, default=1.0)
+    bench.set_defaults(func=run_bench)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import ctypes
+import threading
+import time
+import numpy as np
+from wgc_driver import WGCDriver, CAPTURE_FLAG_CENTER_ROI
+
+
+class FakeClock:
+    """
+    可手動推進的時鐘，取代 time.monotonic 注入 SimulatedWGCLib /
+    StallWatchdog / SnapshotScheduler，讓時間相關的行為可以精確驗證。
+    """
+    def __init__(self, start=0.0):
+        self.now = start
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            return self.now
+
+    def advance(self, seconds):
+        with self._lock:
+            self.now += seconds
+            return self.now
+
+    def sleep(self, seconds):
+        """取代 time.sleep：直接把時鐘往前推"""
+        self.advance(seconds)
+
+
+class SimulatedWGCLib:
+    """
+    模擬 WGC.dll 的匯出函式 (InitCapture / InitCaptureEx / GetLatestFrame /
+    GetCaptureInfo / RestartCapture / CleanupCapture)，讓 WGCDriver 可以在
+    沒有 Windows / 沒有真實視窗的環境下運作。
+
+    幀依照 clock 與 fps 推算「到達」，不開背景執行緒，
+    所以換成假時鐘 (fake clock) 時行為完全可預測。
+    畫面內容為固定漸層背景 + 一個移動方塊，方便測試 tile 差分。
+    """
+    def __init__(self, width=1280, height=720, fps=60.0, clock=time.monotonic):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.clock = clock
+
+        self.roi_x = 0
+        self.roi_y = 0
+        self.roi_w = 0
+        self.roi_h = 0
+
+        self.req_x = 0
+        self.req_y = 0
+        self.req_w = 0
+        self.req_h = 0
+        self.center_roi = False
+
+        self.t0 = None
+        self.has_new_frame = False
+        self.frame_count = 0
+        self.resize_count = 0
+        self.restart_count = 0
+
+        # 接下來幾次 RestartCapture 要模擬失敗
+        self.fail_restarts = 0
+
+        self._tick = 0
+        self._last_tick = 0
+        self._pending_size = None
+        self._stalled = False
+        self._stall_until = None
+        self._background = None
+
+    # ---- DLL exports ----
+    def InitCapture(self, hwnd, crop_x, crop_y, crop_w, crop_h):
+        return self.InitCaptureEx(hwnd, crop_x, crop_y, crop_w, crop_h, 0)
+
+    def InitCaptureEx(self, hwnd, crop_x, crop_y, crop_w, crop_h, flags):
+        self.req_x, self.req_y = crop_x, crop_y
+        self.req_w, self.req_h = crop_w, crop_h
+        self.center_roi = bool(flags & CAPTURE_FLAG_CENTER_ROI)
+        self._apply_roi()
+
+        # 跟 WGC 一樣，第一幀是之後非同步到達的 (1 / fps 秒後)；
+        # WGCDriver 以注入的 sleep 等待，假時鐘下也會推進到第一幀
+        self.t0 = self.clock()
+        self.has_new_frame = False
+        self.frame_count = 0
+        self.resize_count = 0
+        self.restart_count = 0
+        self._tick = 0
+        self._last_tick = 0
+        self._stalled = False
+        return True
+
+    def GetLatestFrame(self, buffer, buffer_size):
+        if self.t0 is None:
+            return False
+        self._advance()
+        # 跟 C++ 一樣：hasNewFrame 一旦為 true 就一直回傳最後一幀 (停滯時也是)
+        if not self.has_new_frame:
+            return False
+
+        size = self.roi_w * self.roi_h * 4
+        if buffer_size != size:
+            return False
+        frame = self.render(self._last_tick)
+        roi = np.ascontiguousarray(frame[self.roi_y:self.roi_y + self.roi_h, self.roi_x:self.roi_x + self.roi_w])
+        ctypes.memmove(buffer, roi.ctypes.data, size)
+        return True
+
+    def GetCaptureInfo(self, info):
+        if self.t0 is None:
+            return False
+        self._advance()
+        info.content_w = self.width
+        info.content_h = self.height
+        info.roi_x = self.roi_x
+        info.roi_y = self.roi_y
+        info.roi_w = self.roi_w
+        info.roi_h = self.roi_h
+        info.resize_count = self.resize_count
+        info.restart_count = self.restart_count
+        info.frame_count = self.frame_count
+        return True
+
+    def RestartCapture(self):
+        if self.t0 is None:
+            return False
+        if self.fail_restarts > 0:
+            self.fail_restarts -= 1
+            return False
+        # 重建 session 會解除停滯；之後的幀正常到達
+        self._advance()
+        self._stalled = False
+        self._stall_until = None
+        self.has_new_frame = False
+        self.restart_count += 1
+        return True
+
+    def CleanupCapture(self):
+        self.t0 = None
+        self.has_new_frame = False
+
+    # ---- 模擬事件 ----
+    def resize(self, width, height):
+        """模擬視窗尺寸變化：下一幀到達時 (如同 C++ 的 FrameArrived) 重建 frame pool"""
+        if self.t0 is None:
+            self.width, self.height = width, height
+            return
+        self._advance()
+        self._pending_size = (width, height)
+
+    def stall(self, duration=None):
+        """
+        模擬停滯 (獨佔全螢幕、alt-tab、目標程式卡住)：從現在起不再有新幀。
+        duration 為 None 時要等 RestartCapture 才會恢復。
+        """
+        self._advance()
+        self._stalled = True
+        self._stall_until = self.clock() + duration if duration is not None else None
+
+    # ---- helpers ----
+    def _apply_roi(self):
+        """與 wgc.cpp 的 CaptureManager::ApplyRoi 相同的規則"""
+        x, y, w, h = 0, 0, self.width, self.height
+        if self.req_w > 0 and self.req_h > 0:
+            w = min(self.req_w, self.width)
+            h = min(self.req_h, self.height)
+            if self.center_roi:
+                x = (self.width - w) // 2
+                y = (self.height - h) // 2
+            else:
+                x = min(max(self.req_x, 0), self.width - w)
+                y = min(max(self.req_y, 0), self.height - h)
+        self.roi_x, self.roi_y, self.roi_w, self.roi_h = x, y, w, h
+
+    def _advance(self):
+        """依時鐘推進，處理這段期間到達的幀 (相當於 C++ 的 FrameArrived)"""
+        if self.t0 is None:
+            return
+        now = self.clock()
+        tick = int((now - self.t0) * self.fps)
+        if tick <= self._tick:
+            return
+        first = self._tick + 1
+        self._tick = tick
+
+        if self._stalled:
+            if self._stall_until is None or now < self._stall_until:
+                return
+            self._stalled = False
+            first = max(first, int((self._stall_until - self.t0) * self.fps) + 1)
+            if first > tick:
+                return
+
+        arrived = tick - first + 1
+        if self._pending_size is not None:
+            self.width, self.height = self._pending_size
+            self._pending_size = None
+            self._apply_roi()
+            self.resize_count += 1
+            self.has_new_frame = False
+            # 觸發重建的那一幀還是舊尺寸，直接丟掉
+            arrived -= 1
+            if arrived <= 0:
+                return
+
+        self.frame_count += arrived
+        self._last_tick = tick
+        self.has_new_frame = True
+
+    def render(self, index):
+        """產生第 index 幀的完整 BGRA 畫面"""
+        if self._background is None or self._background.shape[:2] != (self.height, self.width):
+            xs = np.linspace(0, 255, self.width, dtype=np.uint8)
+            ys = np.linspace(0, 255, self.height, dtype=np.uint8)
+            bg = np.empty((self.height, self.width, 4), dtype=np.uint8)
+            bg[..., 0] = xs[None, :]
+            bg[..., 1] = ys[:, None]
+            bg[..., 2] = 64
+            bg[..., 3] = 255
+            self._background = bg
+
+        frame = self._background.copy()
+        box = max(8, min(self.width, self.height) // 8)
+        span_x = max(1, self.width - box)
+        span_y = max(1, self.height - box)
+        x = (index * 7) % span_x
+        y = (index * 3) % span_y
+        frame[y:y + box, x:x + box, :3] = (255 - index % 256, index % 256, 255)
+        return frame
+
+
+class SimulatedWGCDriver(WGCDriver):
+    """
+    使用 SimulatedWGCLib 的 WGCDriver，介面與真實 Driver 相同。
+    用於 benchmark 與本地測試。
+    """
+    def __init__(self, width=1280, height=720, fps=60.0, clock=time.monotonic):
+        super().__init__(lib=SimulatedWGCLib(width, height, fps, clock),
+                         clock=clock, sleep=getattr(clock, 'sleep', time.sleep))
+        self.hwnd = 1
+        # 每個模擬 Driver 都有自己的 SimulatedWGCLib，等同多工作階段
+        self.supports_sessions = True
+
+    def _get_window_size(self):
+        return self.lib.width, self.lib.height